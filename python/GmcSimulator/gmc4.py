@@ -5,7 +5,28 @@ This module implements the core functionality of the authentic GMC-4 4-bit micro
 including the CPU, memory, and instruction set as documented in the original hardware.
 """
 import time
-from typing import List, Tuple, Callable, Dict, Optional
+from typing import List, Tuple, Callable, Dict, NamedTuple, Optional
+
+try:
+    # Optional compiled fast path (build with: cythonize -i gmc4_core.pyx)
+    from gmc4_core import run_simple as _run_compiled
+except ImportError:
+    _run_compiled = None
+
+class GMC4State(NamedTuple):
+    """Immutable snapshot of the GMC-4 state returned by GMC4.get_state()."""
+    register_a: int
+    register_b: int
+    register_y: int
+    register_z: int
+    pc: int
+    flag: int
+    display_value: int
+    leds: int
+    buzzer_active: int
+    halted: bool
+    waiting_for_input: bool
+
 
 class GMC4:
     """
@@ -13,56 +34,134 @@ class GMC4:
     GMC-4 4-bit microcomputer, implementing the original instruction set.
     """
     
-    # GMC-4 authentic instruction set with mnemonics
-    INSTRUCTION_SET = {
-        0x0: "KA",    # K->Ar (Key to A register)
-        0x1: "AO",    # Ar->Op (A register to Output)
-        0x2: "CH",    # Ar<=>Br, Yr<=>Zr (Exchange register pairs)
-        0x3: "CY",    # Ar<=>Yr (Exchange A and Y registers)
-        0x4: "AM",    # Ar->M (A register to Memory)
-        0x5: "MA",    # M->Ar (Memory to A register)
-        0x6: "M+",    # M+Ar->Ar (Add memory to A register)
-        0x7: "M-",    # M-Ar->Ar (Subtract memory from A register)
-        0x8: "TIA",   # [ ]->Ar (Transfer immediate to A register)
-        0x9: "AIA",   # Ar+[ ]->Ar (Add immediate to A register)
-        0xA: "TIY",   # [ ]->Yr (Transfer immediate to Y register)
-        0xB: "AIY",   # Yr+[ ]->Yr (Add immediate to Y register)
-        0xC: "CIA",   # Ar!=[ ]? (Compare immediate to A register)
-        0xD: "CIY",   # Yr!=[ ]? (Compare immediate to Y register)
-        0xE: "EXT",   # Extended instruction set
-        0xF: "JUMP",  # Jump to address if Flag is 1
-    }
-    
-    # Extended instruction set (E0-EF)
-    EXTENDED_INSTRUCTION_SET = {
-        0x0: "RSTO",  # Clear the 7-segment readout
-        0x1: "SETR",  # Turn on LED using Y register (0-6)
-        0x2: "RSTR",  # Turn off LED using Y register (0-6)
-        0x3: "NONE",  # Not used
-        0x4: "CMPL",  # Complement A register (1<=>0)
-        0x5: "CHNG",  # Swap A/B/Y/Z with A'/B'/Y'/Z'
-        0x6: "SIFT",  # Shift A register right 1 bit
-        0x7: "ENDS",  # Play the End sound
-        0x8: "ERRS",  # Play the Error sound
-        0x9: "SHTS",  # Play a short "pi" sound
-        0xA: "LONS",  # Play a longer "pi-" sound
-        0xB: "SUND",  # Play a note based on A register (1-E)
-        0xC: "TIMR",  # Pause for (A+1)*0.1 seconds
-        0xD: "DSPR",  # Set LEDs with value from data memory
-        0xE: "DEM-",  # Subtract A from data memory as decimal
-        0xF: "DEM+",  # Add A to data memory as decimal
-    }
+    # GMC-4 authentic instruction set with mnemonics, indexed by opcode
+    INSTRUCTION_SET = (
+        "KA",   # 0x0: K->Ar (Key to A register)
+        "AO",   # 0x1: Ar->Op (A register to Output)
+        "CH",   # 0x2: Ar<=>Br, Yr<=>Zr (Exchange register pairs)
+        "CY",   # 0x3: Ar<=>Yr (Exchange A and Y registers)
+        "AM",   # 0x4: Ar->M (A register to Memory)
+        "MA",   # 0x5: M->Ar (Memory to A register)
+        "M+",   # 0x6: M+Ar->Ar (Add memory to A register)
+        "M-",   # 0x7: M-Ar->Ar (Subtract memory from A register)
+        "TIA",  # 0x8: [ ]->Ar (Transfer immediate to A register)
+        "AIA",  # 0x9: Ar+[ ]->Ar (Add immediate to A register)
+        "TIY",  # 0xA: [ ]->Yr (Transfer immediate to Y register)
+        "AIY",  # 0xB: Yr+[ ]->Yr (Add immediate to Y register)
+        "CIA",  # 0xC: Ar!=[ ]? (Compare immediate to A register)
+        "CIY",  # 0xD: Yr!=[ ]? (Compare immediate to Y register)
+        "EXT",  # 0xE: Extended instruction set
+        "JUMP", # 0xF: Jump to address if Flag is 1
+    )
+    
+    # Extended instruction set (E0-EF), indexed by extended opcode
+    EXTENDED_INSTRUCTION_SET = (
+        "RSTO", # 0x0: Clear the 7-segment readout
+        "SETR", # 0x1: Turn on LED using Y register (0-6)
+        "RSTR", # 0x2: Turn off LED using Y register (0-6)
+        "NONE", # 0x3: Not used
+        "CMPL", # 0x4: Complement A register (1<=>0)
+        "CHNG", # 0x5: Swap A/B/Y/Z with A'/B'/Y'/Z'
+        "SIFT", # 0x6: Shift A register right 1 bit
+        "ENDS", # 0x7: Play the End sound
+        "ERRS", # 0x8: Play the Error sound
+        "SHTS", # 0x9: Play a short "pi" sound
+        "LONS", # 0xA: Play a longer "pi-" sound
+        "SUND", # 0xB: Play a note based on A register (1-E)
+        "TIMR", # 0xC: Pause for (A+1)*0.1 seconds
+        "DSPR", # 0xD: Set LEDs with value from data memory
+        "DEM-", # 0xE: Subtract A from data memory as decimal
+        "DEM+", # 0xF: Add A to data memory as decimal
+    )
+    
+    # Number of immediate nibbles that follow each opcode in program memory
+    IMMEDIATE_LENGTHS = (0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 2)
+    # Extra nibbles skipped after each extended opcode (the sound instructions
+    # E7-EB consume one trailing nibble)
+    EXTENDED_SKIP_LENGTHS = (0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 0, 0, 0, 0)
+    # Decimal (BCD) results of DEM+ and DEM-, indexed by (memory << 4) | A
+    DEM_PLUS_TABLE = tuple(
+        (v + a + 6) & 0xF if v + a > 9 else v + a
+        for v in range(16) for a in range(16)
+    )
+    DEM_MINUS_TABLE = tuple(
+        (d - a + 10) & 0xF if d < a else d - a
+        for d in (v if v <= 9 else v - 6 for v in range(16)) for a in range(16)
+    )
+    
+    # Translation table mapping ASCII hex digits to their nibble values, and
+    # every other byte (skipped when loading a program from text)
+    HEX_NIBBLE_TABLE = bytes.maketrans(b"0123456789abcdefABCDEF",
+                                       bytes(range(16)) + bytes(range(10, 16)))
+    NON_HEX_BYTES = bytes(sorted(set(range(256)) - set(b"0123456789abcdefABCDEF")))
+    
+    # Extended opcodes that interact with the outside world (display, LEDs,
+    # sound and timer)
+    EXTENDED_IO = (True, True, True, False, False, False, False, True,
+                   True, True, True, True, True, True, False, False)
     
     # Memory size: 128 nibbles (4-bit values) - authentic GMC-4 memory size
     MEMORY_SIZE = 128
+    # Mask used to wrap addresses; valid because MEMORY_SIZE is a power of two
+    PC_MASK = MEMORY_SIZE - 1
+    assert MEMORY_SIZE & PC_MASK == 0
     # Data memory area starts at 0x50
     DATA_MEMORY_BASE = 0x50
+    # Memory contents after a hard reset: all F, as on the original GMC-4
+    RESET_MEMORY = b'\x0f' * MEMORY_SIZE
+    
+    # Number of taken backward jumps to an address before the straight-line
+    # block starting there is compiled
+    BLOCK_COMPILE_THRESHOLD = 8
+    # Upper bound on the number of instructions in one compiled block
+    MAX_BLOCK_LENGTH = 64
+    
+    # Byte offsets in the buffer filled by snapshot(). They follow the field
+    # order of GMC4State, so they index a GMC4State tuple just as well
+    STATE_A = 0
+    STATE_B = 1
+    STATE_Y = 2
+    STATE_Z = 3
+    STATE_PC = 4
+    STATE_FLAG = 5
+    STATE_DISPLAY = 6
+    STATE_LEDS = 7
+    STATE_BUZZER = 8
+    STATE_HALTED = 9
+    STATE_WAITING = 10
+    STATE_SIZE = 11
+    
+    # Instance attributes live in fixed slots rather than a per-instance dict,
+    # so the registers and the rest of the machine state are stored compactly
+    # and read through slot descriptors
+    __slots__ = (
+        "memory", "_decode_cache", "_block_cache", "_block_counters", "_block_owners",
+        "register_a", "register_b", "register_y", "register_z",
+        "register_a_alt", "register_b_alt", "register_y_alt", "register_z_alt",
+        "_data_addr", "pc", "flag", "display_value", "leds", "buzzer_active",
+        "halted", "waiting_for_input", "_sleep_until", "last_key_pressed",
+        "_from_gui_run", "_debug", "instruction_handlers", "extended_handlers",
+    )
     
     def __init__(self):
         """Initialize the GMC-4 emulator core."""
-        # Initialize memory (4-bit values) - use standard Python list instead of NumPy array
-        # This avoids type issues with numpy arrays
-        self.memory = [0] * self.MEMORY_SIZE
+        # Initialize memory (4-bit values) - a bytearray stores one nibble per byte
+        # and indexing it returns plain ints, avoiding type issues with numpy arrays
+        self.memory = bytearray(self.MEMORY_SIZE)
+        
+        # Decoded instruction cache, one slot per address. Each entry holds
+        # (opcode, handler, operand, next_pc) so that tight loops skip the
+        # fetch/mask/immediate-read work after the first pass.
+        self._decode_cache = [None] * self.MEMORY_SIZE
+        
+        # Compiled basic blocks, one slot per start address. Each entry is
+        # (length, function, writes_output), or False when the block cannot
+        # be compiled.
+        # _block_counters counts backward jumps to find hot loop heads and
+        # _block_owners maps each address to the blocks that cover it.
+        self._block_cache = [None] * self.MEMORY_SIZE
+        self._block_counters = [0] * self.MEMORY_SIZE
+        self._block_owners = [None] * self.MEMORY_SIZE
         
         # CPU registers (all 4-bit)
         self.register_a = 0    # Accumulator
@@ -76,6 +175,10 @@ class GMC4:
         self.register_y_alt = 0
         self.register_z_alt = 0
         
+        # Data memory address selected by Y (DATA_MEMORY_BASE + Y), kept up to
+        # date by every instruction that changes Y
+        self._data_addr = self.DATA_MEMORY_BASE
+        
         # Program counter (8-bit) - use regular Python int to avoid overflow
         self.pc = 0
         
@@ -84,19 +187,25 @@ class GMC4:
         
         # I/O state
         self.display_value = 0   # Current value on 7-segment display
-        self.leds = [0] * 7      # State of the 7 LEDs (0=off, 1=on)
+        self.leds = 0            # State of the 7 LEDs as a bitfield (bit i = LED i)
         self.buzzer_active = 0   # Buzzer active flag
         
         # Status flags
         self.halted = False
         self.waiting_for_input = False
         
+        # Deadline (time.monotonic) until which a TIMR instruction pauses execution
+        self._sleep_until = 0.0
+        
         # Last key pressed (for KA instruction)
         self.last_key_pressed = None
         
         # Flag to indicate run mode initiated from GUI
         self._from_gui_run = False
         
+        # Debug messages are off by default (and compiled out under python -O)
+        self._debug = False
+        
         # Setup instruction execution handlers
         self._setup_instruction_handlers()
         
@@ -105,18 +214,16 @@ class GMC4:
     
     def reset(self):
         """Hard reset the GMC-4 to its initial state."""
-        # In the original GMC-4, hard reset sets all memory to F (not 0)
-        self.memory = [0xF] * self.MEMORY_SIZE
+        # In the original GMC-4, hard reset sets all memory to F (not 0). The
+        # buffer is overwritten in place from the preallocated template
+        self.memory[:] = self.RESET_MEMORY
+        self.invalidate_decode_cache()
         
         # Reset registers
-        self.register_a = 0
-        self.register_b = 0
-        self.register_y = 0
-        self.register_z = 0
-        self.register_a_alt = 0
-        self.register_b_alt = 0
-        self.register_y_alt = 0
-        self.register_z_alt = 0
+        (self.register_a, self.register_b, self.register_y, self.register_z,
+         self.register_a_alt, self.register_b_alt, self.register_y_alt,
+         self.register_z_alt) = (0,) * 8
+        self._data_addr = self.DATA_MEMORY_BASE
         
         # Reset PC and flag
         self.pc = 0
@@ -124,54 +231,57 @@ class GMC4:
         
         # Reset I/O
         self.display_value = 0
-        self.leds = [0] * 7
+        self.leds = 0
         self.buzzer_active = 0
         
         # Reset status
         self.halted = False
         self.waiting_for_input = False
+        self._sleep_until = 0.0
         self.last_key_pressed = None
         self._from_gui_run = False
     
     def _setup_instruction_handlers(self):
         """Set up the instruction execution handlers."""
-        self.instruction_handlers = {
-            0x0: self._exec_ka,    # Key to A register
-            0x1: self._exec_ao,    # A register to Output
-            0x2: self._exec_ch,    # Exchange register pairs
-            0x3: self._exec_cy,    # Exchange A and Y registers
-            0x4: self._exec_am,    # A register to Memory
-            0x5: self._exec_ma,    # Memory to A register
-            0x6: self._exec_mplus, # Add memory to A register
-            0x7: self._exec_mminus,# Subtract memory from A register
-            0x8: self._exec_tia,   # Transfer immediate to A register
-            0x9: self._exec_aia,   # Add immediate to A register
-            0xA: self._exec_tiy,   # Transfer immediate to Y register
-            0xB: self._exec_aiy,   # Add immediate to Y register
-            0xC: self._exec_cia,   # Compare immediate to A register
-            0xD: self._exec_ciy,   # Compare immediate to Y register
-            0xE: self._exec_ext,   # Extended instruction set
-            0xF: self._exec_jump,  # Jump to address if Flag is 1
-        }
-        
-        self.extended_handlers = {
-            0x0: self._exec_ext_rsto,  # Clear the 7-segment readout
-            0x1: self._exec_ext_setr,  # Turn on LED using Y register
-            0x2: self._exec_ext_rstr,  # Turn off LED using Y register
-            0x3: self._exec_ext_none,  # Not used
-            0x4: self._exec_ext_cmpl,  # Complement A register
-            0x5: self._exec_ext_chng,  # Swap register sets
-            0x6: self._exec_ext_sift,  # Shift A register right 1 bit
-            0x7: self._exec_ext_ends,  # Play the End sound
-            0x8: self._exec_ext_errs,  # Play the Error sound
-            0x9: self._exec_ext_shts,  # Play a short sound
-            0xA: self._exec_ext_lons,  # Play a longer sound
-            0xB: self._exec_ext_sund,  # Play a note based on A register
-            0xC: self._exec_ext_timr,  # Pause for time
-            0xD: self._exec_ext_dspr,  # Set LEDs from data memory
-            0xE: self._exec_ext_demminus, # Subtract A from data memory as decimal
-            0xF: self._exec_ext_demplus,  # Add A to data memory as decimal
-        }
+        # Handlers are stored in tuples indexed directly by opcode (0x0-0xF),
+        # which is cheaper to dispatch through than a dict lookup
+        self.instruction_handlers = (
+            self._exec_ka,    # 0x0: Key to A register
+            self._exec_ao,    # 0x1: A register to Output
+            self._exec_ch,    # 0x2: Exchange register pairs
+            self._exec_cy,    # 0x3: Exchange A and Y registers
+            self._exec_am,    # 0x4: A register to Memory
+            self._exec_ma,    # 0x5: Memory to A register
+            self._exec_mplus, # 0x6: Add memory to A register
+            self._exec_mminus,# 0x7: Subtract memory from A register
+            self._exec_tia,   # 0x8: Transfer immediate to A register
+            self._exec_aia,   # 0x9: Add immediate to A register
+            self._exec_tiy,   # 0xA: Transfer immediate to Y register
+            self._exec_aiy,   # 0xB: Add immediate to Y register
+            self._exec_cia,   # 0xC: Compare immediate to A register
+            self._exec_ciy,   # 0xD: Compare immediate to Y register
+            self._exec_ext,   # 0xE: Extended instruction set
+            self._exec_jump,  # 0xF: Jump to address if Flag is 1
+        )
+        
+        self.extended_handlers = (
+            self._exec_ext_rsto,  # 0x0: Clear the 7-segment readout
+            self._exec_ext_setr,  # 0x1: Turn on LED using Y register
+            self._exec_ext_rstr,  # 0x2: Turn off LED using Y register
+            self._exec_ext_none,  # 0x3: Not used
+            self._exec_ext_cmpl,  # 0x4: Complement A register
+            self._exec_ext_chng,  # 0x5: Swap register sets
+            self._exec_ext_sift,  # 0x6: Shift A register right 1 bit
+            self._exec_ext_ends,  # 0x7: Play the End sound
+            self._exec_ext_errs,  # 0x8: Play the Error sound
+            self._exec_ext_shts,  # 0x9: Play a short sound
+            self._exec_ext_lons,  # 0xA: Play a longer sound
+            self._exec_ext_sund,  # 0xB: Play a note based on A register
+            self._exec_ext_timr,  # 0xC: Pause for time
+            self._exec_ext_dspr,  # 0xD: Set LEDs from data memory
+            self._exec_ext_demminus, # 0xE: Subtract A from data memory as decimal
+            self._exec_ext_demplus,  # 0xF: Add A to data memory as decimal
+        )
     
     def step(self) -> bool:
         """
@@ -180,39 +290,300 @@ class GMC4:
         """
         if self.halted:
             return False
+        
+        # Does nothing while still waiting for input or paused by TIMR
+        self.run(1)
+        
+        return not self.halted
+    
+    def run(self, max_steps: int, stop_on_io: bool = False) -> int:
+        """
+        Execute up to max_steps instructions in a single call.
+        
+        The fetch/dispatch loop works on local variables and only writes the
+        program counter back to the emulator when it returns, which makes it
+        considerably cheaper per instruction than calling step() repeatedly.
+        Execution stops early when the emulator halts, waits for input or is
+        paused by a TIMR instruction.
+        
+        Args:
+            max_steps: Maximum number of instructions to execute.
+            stop_on_io: Also stop right after an instruction that reads the
+                keypad or drives the display, LEDs, buzzer or timer.
             
-        if self.waiting_for_input:
-            # Still waiting for input
-            return True
+        Returns:
+            Number of instructions actually executed.
+        """
+        if self.halted or self.waiting_for_input:
+            return 0
+        if self._sleep_until:
+            # Still paused by TIMR
+            if time.monotonic() < self._sleep_until:
+                return 0
+            self._sleep_until = 0.0
+        
+        cache = self._decode_cache
+        decode = self._decode
+        blocks = self._block_cache
+        counters = self._block_counters
+        threshold = self.BLOCK_COMPILE_THRESHOLD
+        run_compiled = _run_compiled
+        extended_io = self.EXTENDED_IO
+        pc = self.pc
+        executed = 0
+        
+        while executed < max_steps:
+            if run_compiled is not None:
+                # Let the compiled core run as many register/memory-only
+                # instructions as it can, then handle the next one here
+                self.pc = pc
+                executed += run_compiled(self, max_steps - executed, stop_on_io)
+                pc = self.pc
+                if executed >= max_steps:
+                    break
+            
+            # Run a whole compiled block if one starts here and fits the budget
+            block = blocks[pc]
+            if block and block[0] <= max_steps - executed and not (stop_on_io and block[2]):
+                pc = block[1](self)
+                executed += block[0]
+                continue
+            
+            # Fetch and decode instruction (cached per address)
+            entry = cache[pc]
+            if entry is None:
+                entry = decode(pc)
+            opcode, handler, operand, next_pc = entry
+            
+            if opcode == 0:
+                # KA reports its address and may block for input, so keep
+                # self.pc current for it
+                self.pc = next_pc
+                
+                # Special case for first instruction in a run sequence
+                # If the program starts with KA (code 0) and no key has been pressed yet,
+                # we'll handle it differently to avoid getting stuck immediately
+                if pc == 1 and self._from_gui_run:  # KA instruction at beginning (after first byte)
+                    # When started from the GUI run mode, provide a dummy key press
+                    # This is similar to how the real GMC-4 behaves when you manually enter run mode
+                    # Use 0 as the dummy key press value - this is more authentic
+                    # as the GMC-4 would typically have 0 in register A after a RESET
+                    self.last_key_pressed = 0
+                    if __debug__ and self._debug:
+                        print("DEBUG: Auto-providing key input at program start (KA at PC=1)")
             
-        # Fetch instruction
-        opcode = self.memory[self.pc] & 0xF
-        
-        # Special case for first instruction in a run sequence
-        # If the program starts with KA (code 0) and no key has been pressed yet,
-        # we'll handle it differently to avoid getting stuck immediately
-        if opcode == 0 and self.pc == 1:  # KA instruction at beginning (after first byte)
-            # When started from the GUI run mode, provide a dummy key press
-            # This is similar to how the real GMC-4 behaves when you manually enter run mode
-            if self._from_gui_run:
-                # Use 0 as the dummy key press value - this is more authentic
-                # as the GMC-4 would typically have 0 in register A after a RESET
-                self.last_key_pressed = 0
-                print("DEBUG: Auto-providing key input at program start (KA at PC=1)")
-        
-        # Increment PC
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
-        
-        # Execute instruction
-        self.instruction_handlers[opcode]()
-        
-        # Ensure registers stay 4-bit
-        self.register_a &= 0xF
-        self.register_b &= 0xF
-        self.register_y &= 0xF
-        self.register_z &= 0xF
+            # Execute instruction; JUMP returns the address to continue from
+            if operand is None:
+                handler()
+            elif opcode == 0xF:
+                next_pc = handler(operand, next_pc)
+                # Backward jumps mark loop heads worth compiling
+                if next_pc <= pc and blocks[next_pc] is None:
+                    counters[next_pc] += 1
+                    if counters[next_pc] >= threshold:
+                        self._compile_block(next_pc)
+            else:
+                handler(operand)
+            pc = next_pc
+            
+            executed += 1
+            if opcode == 0 and self.waiting_for_input:
+                break
+            if opcode == 0xE and operand == 0xC:
+                # TIMR pauses execution until its deadline passes
+                break
+            if stop_on_io and (opcode <= 0x1 or (opcode == 0xE and extended_io[operand])):
+                break
+        
+        self.pc = pc
+        return executed
+    
+    def run_until_io(self, budget: int = 100000) -> int:
+        """
+        Execute instructions until one of them performs I/O.
         
-        return not self.halted
+        Runs until an instruction reads the keypad or changes the display,
+        LEDs, buzzer or timer, the emulator halts or waits for input, or the
+        budget is used up, so callers only need to refresh their view of the
+        emulator when this returns.
+        
+        Args:
+            budget: Maximum number of instructions to execute.
+            
+        Returns:
+            Number of instructions actually executed.
+        """
+        return self.run(budget, stop_on_io=True)
+    
+    def _decode(self, pc: int) -> Tuple:
+        """
+        Decode the instruction at the given address and store it in the cache.
+        
+        Returns:
+            Tuple of (opcode, handler, operand, next_pc). The operand is None
+            for instructions that take no immediate value.
+        """
+        memory = self.memory
+        opcode = memory[pc] & 0xF
+        next_pc = (pc + 1) & self.PC_MASK
+        operand = None
+        
+        length = self.IMMEDIATE_LENGTHS[opcode]
+        if length:
+            # TIA/AIA/TIY/AIY/CIA/CIY and EXT take a single nibble,
+            # JUMP takes a two-nibble address (high, low)
+            operand = memory[next_pc]
+            if length == 2:
+                operand = (operand << 4) | memory[(next_pc + 1) & self.PC_MASK]
+            next_pc = (next_pc + length) & self.PC_MASK
+            
+            if opcode == 0xE:
+                next_pc = (next_pc + self.EXTENDED_SKIP_LENGTHS[operand]) & self.PC_MASK
+        
+        entry = (opcode, self.instruction_handlers[opcode], operand, next_pc)
+        self._decode_cache[pc] = entry
+        return entry
+    
+    def _compile_block(self, start: int):
+        """
+        Compile the straight-line block starting at the given address.
+        
+        The instructions are translated into the source of a single Python
+        function that keeps the registers in locals, so running the block avoids
+        the per-instruction dispatch entirely. The block ends with a JUMP or AM,
+        or before the first instruction that needs the regular handlers (KA,
+        sound, TIMR, LED and register-bank instructions). The function returns
+        the address to continue from.
+        """
+        base = self.DATA_MEMORY_BASE
+        body = []
+        covered = []
+        length = 0
+        writes_output = False
+        pc = start
+        
+        while length < self.MAX_BLOCK_LENGTH:
+            opcode, _, operand, next_pc = self._decode(pc)
+            if opcode == 0x1:    # AO
+                body += ["emu.display_value = a", "flag = 1"]
+                writes_output = True
+            elif opcode == 0x2:  # CH
+                body += ["a, b = b, a", "y, z = z, y", "flag = 1"]
+            elif opcode == 0x3:  # CY
+                body += ["a, y = y, a", "flag = 1"]
+            elif opcode == 0x4:  # AM
+                body += [f"memory[{base} + y] = a",
+                         f"emu.invalidate_decode_cache({base} + y)",
+                         "flag = 1"]
+            elif opcode == 0x5:  # MA
+                body += [f"a = memory[{base} + y]", "flag = 1"]
+            elif opcode == 0x6:  # M+
+                body += [f"a += memory[{base} + y]",
+                         "flag = a >> 4", "a &= 0xF"]
+            elif opcode == 0x7:  # M-
+                body += [f"a -= memory[{base} + y]",
+                         "flag = (a >> 4) & 0x1", "a &= 0xF"]
+            elif opcode == 0x8:  # TIA
+                body += [f"a = {operand & 0xF}", "flag = 1"]
+            elif opcode == 0x9:  # AIA
+                body += [f"a += {operand}", "flag = a >> 4", "a &= 0xF"]
+            elif opcode == 0xA:  # TIY
+                body += [f"y = {operand & 0xF}", "flag = 1"]
+            elif opcode == 0xB:  # AIY
+                body += [f"y += {operand}", "flag = y >> 4", "y &= 0xF"]
+            elif opcode == 0xC:  # CIA
+                body += [f"flag = 0 if a == {operand} else 1"]
+            elif opcode == 0xD:  # CIY
+                body += [f"flag = 0 if y == {operand} else 1"]
+            elif opcode == 0xE and operand == 0x0:  # RSTO
+                body += ["emu.display_value = 0", "flag = 1"]
+                writes_output = True
+            elif opcode == 0xE and operand == 0x3:  # NONE
+                body += ["flag = 1"]
+            elif opcode == 0xE and operand == 0x4:  # CMPL
+                body += ["a = ~a & 0xF", "flag = 1"]
+            elif opcode == 0xE and operand == 0x6:  # SIFT
+                body += ["flag = 0 if a & 0x1 else 1", "a >>= 1"]
+            elif opcode == 0xF:  # JUMP
+                body += [f"next_pc = {operand} if flag == 1 else {next_pc}", "flag = 1"]
+            else:
+                break
+            
+            length += 1
+            while pc != next_pc:
+                covered.append(pc)
+                pc = (pc + 1) & self.PC_MASK
+            
+            # Jumps leave the block, and memory writes may modify the code
+            # that follows them
+            if opcode in (0x4, 0xF) or pc == start:
+                break
+        
+        if length == 0:
+            self._block_cache[start] = False
+            return
+        
+        source = "\n    ".join(
+            ["def block(emu):",
+             "memory = emu.memory",
+             "a = emu.register_a",
+             "b = emu.register_b",
+             "y = emu.register_y",
+             "z = emu.register_z",
+             "flag = emu.flag",
+             f"next_pc = {pc}"]
+            + body
+            + ["emu.register_a = a",
+               "emu.register_b = b",
+               "emu.register_y = y",
+               f"emu._data_addr = {self.DATA_MEMORY_BASE} + y",
+               "emu.register_z = z",
+               "emu.flag = flag",
+               "return next_pc"]
+        )
+        namespace = {}
+        exec(source, namespace)
+        
+        self._block_cache[start] = (length, namespace["block"], writes_output)
+        owners = self._block_owners
+        for address in covered:
+            if owners[address] is None:
+                owners[address] = [start]
+            else:
+                owners[address].append(start)
+    
+    def invalidate_decode_cache(self, address: Optional[int] = None):
+        """
+        Drop cached decodes and compiled blocks after memory has been modified.
+        
+        Args:
+            address: Address that was written, or None to clear the whole cache.
+        """
+        if address is None:
+            # Clear in place so that references held by run() stay valid
+            self._decode_cache[:] = [None] * self.MEMORY_SIZE
+            self._block_cache[:] = [None] * self.MEMORY_SIZE
+            self._block_counters[:] = [0] * self.MEMORY_SIZE
+            self._block_owners[:] = [None] * self.MEMORY_SIZE
+            return
+        
+        owners = self._block_owners[address]
+        if owners is not None:
+            for start in owners:
+                self._block_cache[start] = None
+                self._block_counters[start] = 0
+            self._block_owners[address] = None
+        
+        # Instructions starting up to two nibbles earlier may read this address
+        # as an immediate operand
+        cache = self._decode_cache
+        cache[address] = None
+        cache[(address - 1) & self.PC_MASK] = None
+        cache[(address - 2) & self.PC_MASK] = None
+    
+    def set_debug(self, enabled: bool):
+        """Enable or disable DEBUG messages printed during execution."""
+        self._debug = enabled
     
     def provide_input(self, value: int):
         """
@@ -227,6 +598,7 @@ class GMC4:
         """Set a memory location to a value."""
         if 0 <= address < self.MEMORY_SIZE:
             self.memory[address] = value & 0xF  # Ensure it's 4-bit
+            self.invalidate_decode_cache(address)
     
     def get_memory(self, address: int) -> int:
         """Get the value at a memory location."""
@@ -234,6 +606,23 @@ class GMC4:
             return self.memory[address]
         return 0
     
+    def read_memory(self, start_address: int, end_address: int) -> bytes:
+        """
+        Read a range of memory with slice copies.
+        
+        Args:
+            start_address: First address to read.
+            end_address: Last address to read (inclusive). The range wraps
+                around the end of memory when it is lower than start_address.
+            
+        Returns:
+            The 4-bit values in the range, one per byte.
+        """
+        memory = self.memory
+        if end_address >= start_address:
+            return bytes(memory[start_address:end_address + 1])
+        return bytes(memory[start_address:] + memory[:end_address + 1])
+    
     def load_program(self, program: List[int], start_address: int = 0):
         """
         Load a program into memory.
@@ -242,9 +631,12 @@ class GMC4:
             program: List of 4-bit values representing the program.
             start_address: Starting address in memory to load the program.
         """
-        for i, value in enumerate(program):
-            if start_address + i < self.MEMORY_SIZE:
-                self.memory[start_address + i] = value & 0xF
+        # Copy the part that fits in memory with a single slice assignment
+        end = min(start_address + len(program), self.MEMORY_SIZE)
+        if start_address < end:
+            self.memory[start_address:end] = bytes(
+                value & 0xF for value in program[:end - start_address])
+        self.invalidate_decode_cache()
     
     def load_program_from_text(self, text: str, start_address: int = 0):
         """
@@ -254,17 +646,10 @@ class GMC4:
             text: Hexadecimal string representation of the program.
             start_address: Starting address in memory to load the program.
         """
-        # Remove whitespace and format
-        clean_text = ''.join(text.split()).lower()
-        
-        program = []
-        for c in clean_text:
-            try:
-                value = int(c, 16)
-                program.append(value)
-            except ValueError:
-                # Skip invalid characters
-                pass
+        # Drop whitespace and invalid characters and convert each hex digit
+        # to its value in a single C-level pass
+        program = text.encode('ascii', 'ignore').translate(self.HEX_NIBBLE_TABLE,
+                                                           self.NON_HEX_BYTES)
         
         self.load_program(program, start_address)
     
@@ -277,10 +662,12 @@ class GMC4:
             # Special case for dummy input (0xFF means use 0)
             if self.last_key_pressed == 0xFF:
                 self.register_a = 0
-                print(f"DEBUG: Using special dummy key 0 for KA at PC={self.pc-1}")
+                if __debug__ and self._debug:
+                    print(f"DEBUG: Using special dummy key 0 for KA at PC={self.pc-1}")
             else:
                 self.register_a = self.last_key_pressed
-                print(f"DEBUG: Using provided key {self.last_key_pressed} for KA at PC={self.pc-1}")
+                if __debug__ and self._debug:
+                    print(f"DEBUG: Using provided key {self.last_key_pressed} for KA at PC={self.pc-1}")
             
             self.last_key_pressed = None
             self.flag = 0  # Key was pressed
@@ -289,7 +676,8 @@ class GMC4:
             # Only wait for input if we don't already have a key
             self.waiting_for_input = True
             self.flag = 1  # No key pressed
-            print(f"DEBUG: Waiting for key input for KA at PC={self.pc-1}")
+            if __debug__ and self._debug:
+                print(f"DEBUG: Waiting for key input for KA at PC={self.pc-1}")
     
     def _exec_ao(self):
         """Execute AO instruction: A register to Output."""
@@ -303,146 +691,107 @@ class GMC4:
         self.register_a, self.register_b = self.register_b, self.register_a
         # Swap Y and Z registers
         self.register_y, self.register_z = self.register_z, self.register_y
+        self._data_addr = self.DATA_MEMORY_BASE + self.register_y
         self.flag = 1
     
     def _exec_cy(self):
         """Execute CY instruction: Exchange A and Y registers."""
         # Swap A and Y registers
         self.register_a, self.register_y = self.register_y, self.register_a
+        self._data_addr = self.DATA_MEMORY_BASE + self.register_y
         self.flag = 1
     
     def _exec_am(self):
         """Execute AM instruction: A register to Memory."""
-        # Calculate the memory address (0x50 + Y register)
-        address = self.DATA_MEMORY_BASE + self.register_y
-        # Write A register to memory
-        if 0 <= address < self.MEMORY_SIZE:
-            self.memory[address] = self.register_a
+        # Write A register to memory (0x50 + Y register)
+        address = self._data_addr
+        self.memory[address] = self.register_a
+        self.invalidate_decode_cache(address)
         self.flag = 1
     
     def _exec_ma(self):
         """Execute MA instruction: Memory to A register."""
-        # Calculate the memory address (0x50 + Y register)
-        address = self.DATA_MEMORY_BASE + self.register_y
-        # Read memory to A register
-        if 0 <= address < self.MEMORY_SIZE:
-            self.register_a = self.memory[address]
+        # Read memory (0x50 + Y register) to A register
+        self.register_a = self.memory[self._data_addr]
         self.flag = 1
     
     def _exec_mplus(self):
         """Execute M+ instruction: Add memory to A register."""
-        # Calculate the memory address (0x50 + Y register)
-        address = self.DATA_MEMORY_BASE + self.register_y
-        # Add memory to A register
-        if 0 <= address < self.MEMORY_SIZE:
-            result = self.register_a + self.memory[address]
-            if result > 0xF:
-                self.flag = 1  # Overflow
-            else:
-                self.flag = 0  # No overflow
-            self.register_a = result & 0xF
+        # Add memory (0x50 + Y register) to A register
+        result = self.register_a + self.memory[self._data_addr]
+        self.flag = result >> 4  # Carry bit: 1 on overflow, 0 otherwise
+        self.register_a = result & 0xF
     
     def _exec_mminus(self):
         """Execute M- instruction: Subtract memory from A register."""
-        # Calculate the memory address (0x50 + Y register)
-        address = self.DATA_MEMORY_BASE + self.register_y
-        # Subtract memory from A register
-        if 0 <= address < self.MEMORY_SIZE:
-            result = self.register_a - self.memory[address]
-            if result < 0:
-                self.flag = 1  # Negative result
-            else:
-                self.flag = 0  # Non-negative result
-            self.register_a = result & 0xF
+        # Subtract memory (0x50 + Y register) from A register
+        result = self.register_a - self.memory[self._data_addr]
+        self.flag = (result >> 4) & 0x1  # Borrow bit: 1 if negative, 0 otherwise
+        self.register_a = result & 0xF
     
-    def _exec_tia(self):
+    def _exec_tia(self, immediate: int):
         """Execute TIA instruction: Transfer immediate to A register."""
-        # Get the immediate value (next byte in program)
-        immediate = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # Transfer immediate to A register
-        self.register_a = immediate
+        self.register_a = immediate & 0xF
         self.flag = 1
     
-    def _exec_aia(self):
+    def _exec_aia(self, immediate: int):
         """Execute AIA instruction: Add immediate to A register."""
-        # Get the immediate value (next byte in program)
-        immediate = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # Add immediate to A register
         result = self.register_a + immediate
-        if result > 0xF:
-            self.flag = 1  # Overflow
-        else:
-            self.flag = 0  # No overflow
+        self.flag = result >> 4  # Carry bit: 1 on overflow, 0 otherwise
         self.register_a = result & 0xF
     
-    def _exec_tiy(self):
+    def _exec_tiy(self, immediate: int):
         """Execute TIY instruction: Transfer immediate to Y register."""
-        # Get the immediate value (next byte in program)
-        immediate = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # Transfer immediate to Y register
-        self.register_y = immediate
+        self.register_y = immediate & 0xF
+        self._data_addr = self.DATA_MEMORY_BASE + self.register_y
         self.flag = 1
     
-    def _exec_aiy(self):
+    def _exec_aiy(self, immediate: int):
         """Execute AIY instruction: Add immediate to Y register."""
-        # Get the immediate value (next byte in program)
-        immediate = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # Add immediate to Y register
         result = self.register_y + immediate
-        if result > 0xF:
-            self.flag = 1  # Overflow
-        else:
-            self.flag = 0  # No overflow
+        self.flag = result >> 4  # Carry bit: 1 on overflow, 0 otherwise
         self.register_y = result & 0xF
+        self._data_addr = self.DATA_MEMORY_BASE + self.register_y
     
-    def _exec_cia(self):
+    def _exec_cia(self, immediate: int):
         """Execute CIA instruction: Compare immediate to A register."""
-        # Get the immediate value (next byte in program)
-        immediate = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # Compare immediate to A register
         if self.register_a == immediate:
             self.flag = 0  # Equal
         else:
             self.flag = 1  # Not equal
     
-    def _exec_ciy(self):
+    def _exec_ciy(self, immediate: int):
         """Execute CIY instruction: Compare immediate to Y register."""
-        # Get the immediate value (next byte in program)
-        immediate = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # Compare immediate to Y register
         if self.register_y == immediate:
             self.flag = 0  # Equal
         else:
             self.flag = 1  # Not equal
     
-    def _exec_ext(self):
+    def _exec_ext(self, ext_opcode: int):
         """Execute Extended instruction set (E0-EF)."""
-        # Get the extended opcode (next byte in program)
-        ext_opcode = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # Execute the extended instruction
         self.extended_handlers[ext_opcode]()
     
-    def _exec_jump(self):
-        """Execute JUMP instruction: Jump to address if Flag is 1."""
-        # Get the jump address (next two bytes in program)
-        address_hi = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
-        address_lo = self.memory[self.pc]
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
+    def _exec_jump(self, address: int, next_pc: int) -> int:
+        """
+        Execute JUMP instruction: Jump to address if Flag is 1.
         
+        Returns:
+            The address to continue execution from.
+        """
         # Jump if flag is 1, otherwise just continue
         if self.flag == 1:
-            self.pc = (address_hi << 4) | address_lo
+            next_pc = address
         
         # Set flag to 1 after jump instruction
         self.flag = 1
+        return next_pc
     
     # Extended instruction set execution methods
     def _exec_ext_rsto(self):
@@ -454,14 +803,14 @@ class GMC4:
         """Execute SETR instruction: Turn on LED using Y register (0-6)."""
         led_index = self.register_y & 0x7  # Ensure it's 0-7 (though 7 is unused)
         if 0 <= led_index < 7:
-            self.leds[led_index] = 1  # Turn on the LED
+            self.leds |= 1 << led_index  # Turn on the LED
         self.flag = 1
     
     def _exec_ext_rstr(self):
         """Execute RSTR instruction: Turn off LED using Y register (0-6)."""
         led_index = self.register_y & 0x7  # Ensure it's 0-7 (though 7 is unused)
         if 0 <= led_index < 7:
-            self.leds[led_index] = 0  # Turn off the LED
+            self.leds &= ~(1 << led_index)  # Turn off the LED
         self.flag = 1
     
     def _exec_ext_none(self):
@@ -477,11 +826,12 @@ class GMC4:
     
     def _exec_ext_chng(self):
         """Execute CHNG instruction: Swap A/B/Y/Z with A'/B'/Y'/Z'."""
-        # Swap all registers with their alternate versions
-        (self.register_a, self.register_a_alt) = (self.register_a_alt, self.register_a)
-        (self.register_b, self.register_b_alt) = (self.register_b_alt, self.register_b)
-        (self.register_y, self.register_y_alt) = (self.register_y_alt, self.register_y)
-        (self.register_z, self.register_z_alt) = (self.register_z_alt, self.register_z)
+        # Swap all registers with their alternate versions in one assignment
+        (self.register_a, self.register_b, self.register_y, self.register_z,
+         self.register_a_alt, self.register_b_alt, self.register_y_alt, self.register_z_alt) = (
+            self.register_a_alt, self.register_b_alt, self.register_y_alt, self.register_z_alt,
+            self.register_a, self.register_b, self.register_y, self.register_z)
+        self._data_addr = self.DATA_MEMORY_BASE + self.register_y
         self.flag = 1
     
     def _exec_ext_sift(self):
@@ -500,8 +850,6 @@ class GMC4:
         # Simulate playing the end sound
         self.buzzer_active = 1
         self.flag = 1
-        # Increment PC
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # In a real implementation, we would play the sound
         # For now, just set a flag that can be used by the GUI
     
@@ -510,8 +858,6 @@ class GMC4:
         # Simulate playing the error sound
         self.buzzer_active = 2
         self.flag = 1
-        # Increment PC
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # In a real implementation, we would play the sound
     
     def _exec_ext_shts(self):
@@ -519,8 +865,6 @@ class GMC4:
         # Simulate playing a short sound
         self.buzzer_active = 3
         self.flag = 1
-        # Increment PC
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # In a real implementation, we would play the sound
     
     def _exec_ext_lons(self):
@@ -528,8 +872,6 @@ class GMC4:
         # Simulate playing a longer sound
         self.buzzer_active = 4
         self.flag = 1
-        # Increment PC
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
         # In a real implementation, we would play the sound
     
     def _exec_ext_sund(self):
@@ -539,16 +881,14 @@ class GMC4:
             self.buzzer_active = 5
             # In a real implementation, we would play the note
         self.flag = 1
-        # Increment PC
-        self.pc = (self.pc + 1) % self.MEMORY_SIZE
     
     def _exec_ext_timr(self):
         """Execute TIMR instruction: Pause for (A+1)*0.1 seconds."""
         # Calculate the delay time
         delay_time = (self.register_a + 1) * 0.1
-        # In a real implementation, we would delay execution
-        # For simulation purposes, we'll just sleep
-        time.sleep(delay_time)
+        # Instead of sleeping (which would block the caller), set a deadline;
+        # run() executes nothing until it has passed
+        self._sleep_until = time.monotonic() + delay_time
         self.flag = 1
     
     def _exec_ext_dspr(self):
@@ -557,79 +897,107 @@ class GMC4:
         lower_bits = self.get_memory(0x5E) & 0xF  # Lower 4 bits
         upper_bits = self.get_memory(0x5F) & 0x7  # Upper 3 bits
         
-        # Set the LEDs
-        for i in range(4):
-            self.leds[i] = (lower_bits >> i) & 0x1
-        for i in range(3):
-            self.leds[i+4] = (upper_bits >> i) & 0x1
+        # Set the LEDs (LEDs 0-3 from the lower bits, 4-6 from the upper bits)
+        self.leds = (upper_bits << 4) | lower_bits
         
         self.flag = 1
     
     def _exec_ext_demminus(self):
         """Execute DEM- instruction: Subtract A from data memory as decimal."""
-        # Calculate the memory address (0x50 + Y register)
-        address = self.DATA_MEMORY_BASE + self.register_y
+        # Memory address (0x50 + Y register)
+        address = self._data_addr
         
-        if 0 <= address < self.MEMORY_SIZE:
-            # Get the current value
-            value = self.memory[address]
-            
-            # Subtract A register as decimal
-            result = (value if value <= 9 else value - 6) - self.register_a
-            
-            # Handle underflow in BCD
-            if result < 0:
-                result = (result + 10) & 0xF
-            
-            # Store the result
-            self.memory[address] = result
+        # Subtract A register as decimal (underflow handled by the table)
+        result = self.DEM_MINUS_TABLE[(self.memory[address] << 4) | self.register_a]
+        
+        # Store the result
+        self.memory[address] = result
+        self.invalidate_decode_cache(address)
         
         # Decrement Y register
         self.register_y = (self.register_y - 1) & 0xF
+        self._data_addr = self.DATA_MEMORY_BASE + self.register_y
         
         self.flag = 1
     
     def _exec_ext_demplus(self):
         """Execute DEM+ instruction: Add A to data memory as decimal."""
-        # Calculate the memory address (0x50 + Y register)
-        address = self.DATA_MEMORY_BASE + self.register_y
+        # Memory address (0x50 + Y register)
+        address = self._data_addr
         
-        if 0 <= address < self.MEMORY_SIZE:
-            # Get the current value
-            value = self.memory[address]
-            
-            # Add A register as decimal
-            result = value + self.register_a
-            
-            # Handle overflow in BCD
-            if result > 9:
-                result = (result + 6) & 0xF
-            
-            # Store the result
-            self.memory[address] = result
+        # Add A register as decimal (overflow handled by the table)
+        result = self.DEM_PLUS_TABLE[(self.memory[address] << 4) | self.register_a]
+        
+        # Store the result
+        self.memory[address] = result
+        self.invalidate_decode_cache(address)
         
         # Decrement Y register
         self.register_y = (self.register_y - 1) & 0xF
+        self._data_addr = self.DATA_MEMORY_BASE + self.register_y
         
         self.flag = 1
     
-    def get_state(self) -> Dict:
+    def get_state(self) -> GMC4State:
         """
         Get the current state of the GMC-4.
         
+        Returns:
+            GMC4State snapshot of the current state of the emulator.
+        """
+        return GMC4State(
+            self.register_a,
+            self.register_b,
+            self.register_y,
+            self.register_z,
+            self.pc,
+            self.flag,
+            self.display_value,
+            self.leds,
+            self.buzzer_active,
+            self.halted,
+            self.waiting_for_input,
+        )
+    
+    def snapshot(self, buf: Optional[bytearray] = None) -> bytearray:
+        """
+        Copy the current state of the GMC-4 into a byte buffer.
+        
+        Unlike get_state(), this reuses a preallocated buffer, so polling the
+        state does not allocate. Read it with the STATE_* offsets.
+        
+        Args:
+            buf: bytearray of STATE_SIZE bytes to fill; a new one is created
+                when omitted.
+            
+        Returns:
+            The filled buffer.
+        """
+        if buf is None:
+            buf = bytearray(self.STATE_SIZE)
+        buf[:] = (
+            self.register_a,
+            self.register_b,
+            self.register_y,
+            self.register_z,
+            self.pc,
+            self.flag,
+            self.display_value,
+            self.leds,
+            self.buzzer_active,
+            self.halted,
+            self.waiting_for_input,
+        )
+        return buf
+    
+    def get_state_dict(self) -> Dict:
+        """
+        Get the current state of the GMC-4 as a dictionary.
+        
         Returns:
             Dictionary containing the current state of the emulator.
         """
-        return {
-            'register_a': self.register_a,
-            'register_b': self.register_b,
-            'register_y': self.register_y,
-            'register_z': self.register_z,
-            'pc': self.pc,
-            'flag': self.flag,
-            'display_value': self.display_value,
-            'leds': self.leds.copy(),
-            'buzzer_active': self.buzzer_active,
-            'halted': self.halted,
-            'waiting_for_input': self.waiting_for_input,
-        }
+        state = self.get_state()._asdict()
+        # Expand the LED bitfield into one 0/1 entry per LED
+        state['leds'] = [(state['leds'] >> i) & 0x1 for i in range(7)]
+        return state
@@ -0,0 +1,152 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+GMC-4 Emulator Compiled Core
+
+Optional Cython implementation of the fetch-decode-execute loop for the
+instructions that only touch registers and memory. The pure-Python GMC4 class
+uses it automatically when it has been built, and falls back to its own
+handlers otherwise.
+
+Build it in place with:
+    cythonize -i gmc4_core.pyx
+"""
+
+
+def run_simple(emu, int max_steps, bint stop_on_output=False):
+    """
+    Execute up to max_steps instructions directly in C.
+
+    Execution stops before the first instruction that needs the Python side
+    (KA, sound, TIMR, LED and other extended instructions), leaving the program
+    counter pointing at it so the caller can run it with the regular handlers.
+
+    Args:
+        emu: The GMC4 instance whose state is read and written back.
+        max_steps: Maximum number of instructions to execute.
+        stop_on_output: Also hand display writes (AO, RSTO) to the Python side,
+            so the caller can stop right after them.
+
+    Returns:
+        Number of instructions actually executed.
+    """
+    cdef unsigned char[:] memory = emu.memory
+    cdef int size = emu.MEMORY_SIZE
+    cdef int mask = size - 1
+    cdef int data_base = emu.DATA_MEMORY_BASE
+
+    cdef int pc = emu.pc
+    cdef int a = emu.register_a
+    cdef int b = emu.register_b
+    cdef int y = emu.register_y
+    cdef int z = emu.register_z
+    cdef int flag = emu.flag
+    cdef int display = emu.display_value
+
+    cdef int executed = 0
+    cdef int opcode, operand, address, result
+
+    while executed < max_steps:
+        if pc < 0 or pc >= size:
+            # Out of range jump target, let the Python side report it
+            break
+
+        opcode = memory[pc] & 0xF
+
+        if opcode == 0x1:    # AO
+            if stop_on_output:
+                break
+            display = a
+            flag = 1
+            pc = (pc + 1) & mask
+        elif opcode == 0x2:  # CH
+            a, b = b, a
+            y, z = z, y
+            flag = 1
+            pc = (pc + 1) & mask
+        elif opcode == 0x3:  # CY
+            a, y = y, a
+            flag = 1
+            pc = (pc + 1) & mask
+        elif opcode == 0x4:  # AM
+            address = data_base + y
+            memory[address] = a
+            flag = 1
+            pc = (pc + 1) & mask
+            # Keep the Python decode cache coherent with the write
+            emu.invalidate_decode_cache(address)
+        elif opcode == 0x5:  # MA
+            a = memory[data_base + y]
+            flag = 1
+            pc = (pc + 1) & mask
+        elif opcode == 0x6:  # M+
+            result = a + memory[data_base + y]
+            flag = 1 if result > 0xF else 0
+            a = result & 0xF
+            pc = (pc + 1) & mask
+        elif opcode == 0x7:  # M-
+            result = a - memory[data_base + y]
+            flag = 1 if result < 0 else 0
+            a = result & 0xF
+            pc = (pc + 1) & mask
+        elif opcode >= 0x8 and opcode <= 0xD:
+            operand = memory[(pc + 1) & mask]
+            if opcode == 0x8:    # TIA
+                a = operand & 0xF
+                flag = 1
+            elif opcode == 0x9:  # AIA
+                result = a + operand
+                flag = 1 if result > 0xF else 0
+                a = result & 0xF
+            elif opcode == 0xA:  # TIY
+                y = operand & 0xF
+                flag = 1
+            elif opcode == 0xB:  # AIY
+                result = y + operand
+                flag = 1 if result > 0xF else 0
+                y = result & 0xF
+            elif opcode == 0xC:  # CIA
+                flag = 0 if a == operand else 1
+            else:                # CIY
+                flag = 0 if y == operand else 1
+            pc = (pc + 2) & mask
+        elif opcode == 0xE:
+            operand = memory[(pc + 1) & mask]
+            if operand == 0x6:    # SIFT
+                flag = 1 if (a & 0x1) == 0 else 0
+                a = (a >> 1) & 0xF
+            else:
+                if operand == 0x0:    # RSTO
+                    if stop_on_output:
+                        break
+                    display = 0
+                elif operand == 0x3:  # NONE
+                    pass
+                elif operand == 0x4:  # CMPL
+                    a = (~a) & 0xF
+                else:
+                    # Other extended instructions run on the Python side
+                    break
+                flag = 1
+            pc = (pc + 2) & mask
+        elif opcode == 0xF:  # JUMP
+            address = (memory[(pc + 1) & mask] << 4) | memory[(pc + 2) & mask]
+            if flag == 1:
+                pc = address
+            else:
+                pc = (pc + 3) & mask
+            flag = 1
+        else:
+            # KA needs the Python side for keyboard input
+            break
+
+        executed += 1
+
+    emu.pc = pc
+    emu.register_a = a
+    emu.register_b = b
+    emu.register_y = y
+    emu._data_addr = data_base + y
+    emu.register_z = z
+    emu.flag = flag
+    emu.display_value = display
+    return executed
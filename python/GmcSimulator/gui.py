@@ -5,9 +5,37 @@ This module implements the graphical user interface for the GMC-4 simulator.
 """
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, simpledialog
+import os
 import time
+import queue
+import threading
+from functools import lru_cache, partial
 from gmc4 import GMC4
 
+
+@lru_cache(maxsize=1024)
+def _format_registers(a, b, y, z, flag):
+    """Format the register display text, memoized per register state."""
+    # Registers are 4-bit, so each one is a single hex digit lookup
+    hex_digits = GMC4GUI.HEX_DIGITS
+    return f"A: {hex_digits[a]}  B: {hex_digits[b]}  Y: {hex_digits[y]}  Z: {hex_digits[z]}  F: {flag}"
+
+
+def _build_fill_table(segment_bits, colors):
+    """
+    Build the seven-segment fill color table.
+    
+    Args:
+        segment_bits: Segment bitmask for each digit (bits 0-6 = A-G).
+        colors: (off, on) fill colors.
+        
+    Returns:
+        Tuple with the fill colors of segments A-G for each digit.
+    """
+    return tuple(tuple(colors[(bits >> i) & 0x1] for i in range(7))
+                 for bits in segment_bits)
+
+
 class GMC4GUI:
     """
     GUI class for the GMC-4 simulator. Provides a visual representation 
@@ -30,6 +58,28 @@ class GMC4GUI:
         "RESET": "RESET"
     }
     
+    # Computer keyboard shortcuts for the keypad: keysym -> keypad key
+    HARDWARE_KEYS = {
+        **{d: d for d in "0123456789ABCDEF"},
+        **{d.lower(): d for d in "ABCDEF"},
+        **{f"KP_{d}": d for d in "0123456789"},
+        "F1": "ASET",
+        "F2": "INCR",
+        "F3": "RUN",
+        "F4": "RESET",
+    }
+    
+    # Buffer size for program file reads and writes
+    FILE_BUFFER_SIZE = 1 << 16
+    
+    # Repeats of the same keyboard key closer together than this (in seconds)
+    # are ignored
+    KEY_REPEAT_INTERVAL = 0.02
+    
+    # Speed scale changes are applied once the scale has been still for this
+    # long (in ms), instead of on every step of a drag
+    SPEED_DEBOUNCE_MS = 50
+    
     # Colors
     COLORS = {
         "background": "#303030",
@@ -43,6 +93,167 @@ class GMC4GUI:
         "highlight": "#FFA500"
     }
     
+    # Memory viewer cell geometry in pixels (16 cells per row plus a row header)
+    MEM_CELL_WIDTH = 20
+    MEM_CELL_HEIGHT = 20
+    MEM_HEADER_WIDTH = 30
+    
+    # Hex digit for each nibble value
+    HEX_DIGITS = "0123456789ABCDEF"
+    
+    # bytes.translate() table mapping nibble values to ASCII hex digits
+    HEX_TRANSLATION = bytes.maketrans(bytes(range(16)), HEX_DIGITS.encode('ascii'))
+    
+    # Maximum number of instructions executed per run tick; the emulator stops
+    # earlier as soon as an instruction performs I/O
+    RUN_STEP_BUDGET = 1000
+    
+    # At the highest speed setting the emulator runs RUN_STEP_BUDGET batches
+    # back to back without stopping at I/O, for as long as a frame lasts. The
+    # GUI picks up the latest emulator state once per frame while running
+    MAX_SPEED = 10
+    FRAME_PERIOD_MS = 16
+    
+    # While running, the memory viewer is repainted at most this often (in
+    # seconds) unless the PC moves to another 16-cell row
+    MEM_REPAINT_INTERVAL = 0.1
+    
+    # How often (in seconds) the run thread checks for a stop request while
+    # the program waits for a key
+    INPUT_POLL_INTERVAL = 0.05
+    
+    # Display parts that can be marked for repaint with mark_dirty()
+    DIRTY_MEM = 0x01
+    DIRTY_LEDS = 0x02
+    DIRTY_DISPLAY = 0x04
+    DIRTY_REGS = 0x08
+    DIRTY_STATUS = 0x10
+    DIRTY_BUZZER = 0x20
+    DIRTY_ALL = 0x3F
+    
+    # Display parts to repaint when each GMC4.STATE_* field of a run thread
+    # snapshot changes. A is shown on the display while waiting for a key, and
+    # the PC is highlighted in the memory viewer
+    STATE_DIRTY = (
+        DIRTY_REGS | DIRTY_DISPLAY,    # STATE_A
+        DIRTY_REGS,                    # STATE_B
+        DIRTY_REGS,                    # STATE_Y
+        DIRTY_REGS,                    # STATE_Z
+        DIRTY_MEM,                     # STATE_PC
+        DIRTY_REGS,                    # STATE_FLAG
+        DIRTY_DISPLAY,                 # STATE_DISPLAY
+        DIRTY_LEDS,                    # STATE_LEDS
+        DIRTY_BUZZER,                  # STATE_BUZZER
+        DIRTY_STATUS | DIRTY_DISPLAY,  # STATE_HALTED
+        DIRTY_STATUS | DIRTY_DISPLAY,  # STATE_WAITING
+    )
+    
+    # On/off state of each LED indicator (left to right) for every 7-bit value.
+    # In edit mode the LEDs show the current address with LED 6 on the left;
+    # when running they show the program's LED register bits in indicator order
+    ADDRESS_LED_PATTERNS = tuple(tuple((v >> (6 - i)) & 1 for i in range(7))
+                                 for v in range(128))
+    PROGRAM_LED_PATTERNS = tuple(tuple((v >> i) & 1 for i in range(7))
+                                 for v in range(128))
+    
+    # Mode indicator text by (input_mode, waiting_for_input). Address and data
+    # input take precedence over a program waiting for a key
+    MODE_TEXT = {
+        (0, False): "Mode: Normal",
+        (0, True): "Mode: Waiting for Input",
+        (1, False): "Mode: Address Input",
+        (1, True): "Mode: Address Input",
+        (2, False): "Mode: Data Input",
+        (2, True): "Mode: Data Input",
+        (3, False): "Mode: Normal",
+        (3, True): "Mode: Waiting for Input",
+    }
+    
+    # Run status text by (halted, waiting_for_input, running)
+    STATUS_TEXT = {
+        (False, False, False): "Status: Stopped",
+        (False, False, True): "Status: Running",
+        (False, True, False): "Status: Waiting for Input",
+        (False, True, True): "Status: Waiting for Input",
+        (True, False, False): "Status: Halted",
+        (True, False, True): "Status: Halted",
+        (True, True, False): "Status: Halted",
+        (True, True, True): "Status: Halted",
+    }
+    
+    # Instruction reference text, shown on demand in the control panel
+    INSTRUCTION_REFERENCE = (
+        "0: KA - Key to A register\n"
+        "1: AO - A register to Output\n"
+        "2: CH - Exchange A/B and Y/Z\n"
+        "3: CY - Exchange A and Y\n"
+        "4: AM - A register to Memory\n"
+        "5: MA - Memory to A register\n"
+        "6: M+ - Add memory to A\n"
+        "7: M- - Subtract memory from A\n"
+        "8: TIA [ ] - Immediate to A\n"
+        "9: AIA [ ] - Add immediate to A\n"
+        "A: TIY [ ] - Immediate to Y\n"
+        "B: AIY [ ] - Add immediate to Y\n"
+        "C: CIA [ ] - Compare immediate to A\n"
+        "D: CIY [ ] - Compare immediate to Y\n"
+        "E: Extended instruction set\n"
+        "F: JUMP [ ] [ ] - Jump to address\n"
+        "\n"
+        "Extended (E0-EF):\n"
+        "E0: RSTO - Clear display\n"
+        "E1: SETR - Turn on LED by Y\n"
+        "E2: RSTR - Turn off LED by Y\n"
+        "E4: CMPL - Complement A\n"
+        "E5: CHNG - Swap register sets\n"
+        "E6: SIFT - Shift A right\n"
+        "E7-EA: Sound instructions\n"
+        "EB: SUND - Play note by A\n"
+        "EC: TIMR - Delay by A value\n"
+        "ED: DSPR - Set LEDs from memory\n"
+        "EE: DEM- - Decimal subtract\n"
+        "EF: DEM+ - Decimal add"
+    )
+    
+    # Usage instructions shown by the Help button
+    HELP_TEXT = (
+        "GMC-4 Simulator Usage Instructions:\n"
+        "\n"
+        "BASIC OPERATION:\n"
+        "- The GMC-4 has 128 bytes of memory (addresses 00-7F)\n"
+        "- Memory values and instructions are 4-bit (0-F)\n"
+        "- 7 LEDs (labeled 6-0) show the binary value of the current address\n"
+        "- The single 7-segment display shows the value at the current address\n"
+        "\n"
+        "KEYPAD FUNCTIONS:\n"
+        "- Hexadecimal keys (0-F): Enter data values directly into memory\n"
+        "- ASET: Enter address selection mode (input two hex digits)\n"
+        "- INCR: Increment the current address by 1\n"
+        "- RESET: Reset the program counter to address 0\n"
+        "- RUN: Run the program starting from the current address\n"
+        "- Computer keyboard: 0-9 and A-F for the hex keys, F1 = ASET, F2 = INCR,\n"
+        "  F3 = RUN, F4 = RESET\n"
+        "\n"
+        "PROGRAM EXECUTION SEQUENCE:\n"
+        "1. Press RESET\n"
+        "2. Press 1 (this sets run mode without modifying memory)\n"
+        "3. Press RUN (execution begins from address 01)\n"
+        "\n"
+        "The buzzer provides different sounds:\n"
+        "- End sound (E7): Program completion\n"
+        "- Error sound (E8): Error condition\n"
+        "- Short beep (E9): Quick notification\n"
+        "- Long beep (EA): Extended notification \n"
+        "- Note sound (EB): Musical note based on A register value\n"
+        "\n"
+        "MEMORY MAP:\n"
+        "- 00-4F: Program memory\n"
+        "- 50-6F: Data memory (for variables)\n"
+        "- 70-7F: Display memory\n"
+        "\n"
+        "More details can be found in the Instruction Reference section."
+    )
+    
     def __init__(self, root):
         """
         Initialize the GMC-4 GUI.
@@ -53,9 +264,16 @@ class GMC4GUI:
         self.root = root
         self.root.configure(bg=self.COLORS["background"])
         
+        # Control panel widgets, set once the panel is built
+        self.status_indicator = None
+        self.register_display = None
+        
         # Create the GMC-4 emulator
         self.gmc4 = GMC4()
         
+        # Pending after() id of a debounced speed change
+        self._speed_after = None
+        
         # Create the main frame
         self.main_frame = tk.Frame(root, bg=self.COLORS["background"], padx=20, pady=20)
         self.main_frame.pack(fill=tk.BOTH, expand=True)
@@ -67,6 +285,22 @@ class GMC4GUI:
         # Execution state
         self.running = False
         self.run_delay = 100  # ms between steps when running
+        self._batch_run = False  # run whole batches per frame (maximum speed)
+        
+        # The program runs in a background thread. It hands state snapshots to
+        # the GUI through _state_queue (latest only) and receives key presses
+        # through _input_queue; _emu_lock guards direct emulator edits
+        self._worker = None
+        self._stop_event = threading.Event()
+        self._emu_lock = threading.Lock()
+        self._state_queue = queue.Queue(maxsize=1)
+        self._input_queue = queue.Queue()
+        self._run_state = None  # Latest snapshot (bytes) from the run thread
+        self._drain_after = None  # after() id of the next _drain_state poll
+        
+        # Reused state buffer for repaints while no program runs, read with
+        # the GMC4.STATE_* offsets
+        self._state_buf = bytearray(GMC4.STATE_SIZE)
         
         # Current memory address for viewing/editing
         self.current_address = 0
@@ -79,18 +313,84 @@ class GMC4GUI:
         # Status message for temporary notifications instead of popups
         self.status_message = ""
         
+        # Last values pushed to the widgets, so a repaint only issues Tk calls
+        # for the parts that actually changed
+        self._mem_prev = None  # Memory snapshot shown in the memory viewer
+        self._mem_highlights = {}  # Highlighted memory cells -> background color
+        self._last_mem_paint = 0.0  # monotonic() time of the last memory repaint
+        self._last_pc_row = None  # PC row (pc >> 4) at the last memory repaint
+        self._mem_repaint_after = None  # after() id of a deferred memory repaint
+        self._last_led_pattern = None
+        self._last_buzzer_color = None
+        self._last_mode_text = None
+        self._last_status_text = None
+        self._last_status_message = None
+        self._last_register_text = None
+        
+        # Whether a buzzer reset is already scheduled
+        self._buzzer_reset_pending = False
+        
+        # Parts of the GUI waiting for the next coalesced repaint
+        self._dirty = 0
+        self._repaint_scheduled = False
+        
+        # Route computer keyboard presses straight to the keypad handlers. The
+        # binding is on the main window only, so typing in dialogs (including
+        # the file dialogs Tcl builds itself) never reaches the keypad
+        self._last_hw_key = None
+        self._last_hw_key_time = 0.0
+        self.root.bind("<Key>", self._on_hw_key)
+        
         # Update display initially
         self.update_displays()
         
     def clear_status_message(self):
         """Clear the status message after a timeout."""
         self.status_message = ""
-        self.update_displays()
+        self.mark_dirty(self.DIRTY_STATUS)
         
     def reset_buzzer(self):
         """Reset the buzzer active flag in the GMC-4 emulator."""
-        self.gmc4.buzzer_active = 0
-        self.update_displays()
+        with self._emu_lock:
+            self.gmc4.buzzer_active = 0
+        
+        if self._worker is not None:
+            # Repaints use the run thread snapshot, which only gets refreshed
+            # when the program runs on, so clear the buzzer in it as well
+            state = bytearray(self._run_state)
+            state[GMC4.STATE_BUZZER] = 0
+            self._run_state = bytes(state)
+        self.mark_dirty(self.DIRTY_BUZZER)
+    
+    def _do_reset_buzzer(self):
+        """Run the scheduled buzzer reset, allowing a new one to be scheduled."""
+        self._buzzer_reset_pending = False
+        self.reset_buzzer()
+    
+    def _on_hw_key(self, event):
+        """Handle a computer keyboard press as the matching keypad key."""
+        # Only handle keys in the main window, and leave typing in text fields
+        # (reference text) alone. Widgets tkinter cannot resolve, such as those
+        # of native dialogs, are reported as plain path strings
+        widget = event.widget
+        if isinstance(widget, (str, tk.Entry, tk.Text)) or widget.winfo_toplevel() is not self.root:
+            return
+        
+        key = self.HARDWARE_KEYS.get(event.keysym)
+        if key is None:
+            return
+        
+        # Throttle auto-repeat of a held key
+        now = time.monotonic()
+        if key == self._last_hw_key and now - self._last_hw_key_time < self.KEY_REPEAT_INTERVAL:
+            return
+        self._last_hw_key = key
+        self._last_hw_key_time = now
+        
+        if key in self.FUNC_KEYS:
+            self.on_function_key(key)
+        else:
+            self.on_keypad_press(key)
     
     def create_simulator_panel(self):
         """Create the panel containing the GMC-4 display and keypad."""
@@ -116,8 +416,8 @@ class GMC4GUI:
             led = tk.Canvas(led_frame, width=20, height=20, bg="#006600", 
                            highlightthickness=0)
             led.grid(row=0, column=i, padx=10)
-            led.create_oval(2, 2, 18, 18, fill=self.COLORS["led_off"], outline="#000000")
-            self.led_indicators.append(led)
+            oval_id = led.create_oval(2, 2, 18, 18, fill=self.COLORS["led_off"], outline="#000000")
+            self.led_indicators.append((led, oval_id))
             
             # LED number label (6 to 0, left to right)
             led_label = tk.Label(led_frame, text=f"LED {position}", bg="#006600", 
@@ -143,7 +443,8 @@ class GMC4GUI:
         self.buzzer_indicator = tk.Canvas(buzzer_frame, width=30, height=30, 
                                         bg="#000000", highlightthickness=0)
         self.buzzer_indicator.pack(pady=5)
-        self.buzzer_indicator.create_oval(5, 5, 25, 25, fill="#333333", outline="#555555")
+        self._buzzer_oval = self.buzzer_indicator.create_oval(5, 5, 25, 25, fill="#333333",
+                                                              outline="#555555")
         
         # Store PC and Accumulator internally, but don't display them since the original
         # GMC-4 doesn't show these values directly
@@ -181,13 +482,13 @@ class GMC4GUI:
                                   bg="#404040", fg="white",
                                   activebackground="#606060",
                                   font=("Arial", 10, "bold"),
-                                  command=lambda k=key: self.on_function_key(k))
+                                  command=partial(self.on_function_key, key))
                 else:  # Regular hex key
                     btn = tk.Button(keypad_frame, text=key, width=4, height=2,
                                   bg="#303030", fg="white",
                                   activebackground="#505050",
                                   font=("Arial", 12, "bold"),
-                                  command=lambda k=key: self.on_keypad_press(k))
+                                  command=partial(self.on_keypad_press, key))
                 btn.grid(row=row_idx, column=col_idx, padx=5, pady=5)
                 self.keypad_buttons[key] = btn
     
@@ -215,31 +516,42 @@ class GMC4GUI:
                                     padx=10, pady=10)
         memory_frame.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
         
-        # Memory display as a grid (rows based on memory size)
-        self.memory_labels = {}  # Use a dictionary to map addresses to labels
-        mem_display_frame = tk.Frame(memory_frame, bg=self.COLORS["panel"])
-        mem_display_frame.pack(fill=tk.BOTH, expand=True)
+        # Memory display as a grid drawn on a single canvas (rows based on
+        # memory size), with one background rectangle and one text item per cell
+        rows = self.gmc4.MEMORY_SIZE // 16
+        cell_w = self.MEM_CELL_WIDTH
+        cell_h = self.MEM_CELL_HEIGHT
+        header_w = self.MEM_HEADER_WIDTH
+        self.mem_canvas = tk.Canvas(memory_frame, width=header_w + 16 * cell_w,
+                                    height=(rows + 1) * cell_h,
+                                    bg=self.COLORS["panel"], highlightthickness=0)
+        self.mem_canvas.pack(fill=tk.BOTH, expand=True)
+        self._mem_rect_ids = []  # Background rectangle item per address
+        self._mem_text_ids = []  # Hex digit text item per address
         
         # Header row (column numbers 0-F)
-        tk.Label(mem_display_frame, text="", width=3, bg=self.COLORS["panel"], 
-                fg=self.COLORS["text"]).grid(row=0, column=0)
-        
+        hex_digits = self.HEX_DIGITS
         for col in range(16):
-            tk.Label(mem_display_frame, text=f"{col:X}", width=2, 
-                    bg=self.COLORS["panel"], fg=self.COLORS["text"]).grid(row=0, column=col+1)
+            self.mem_canvas.create_text(header_w + col * cell_w + cell_w // 2, cell_h // 2,
+                                        text=hex_digits[col], fill=self.COLORS["text"])
         
         # Memory grid - limit to 8 rows for 128 bytes (authentic GMC-4 memory size)
-        for row in range(8):
+        for row in range(rows):
+            y = (row + 1) * cell_h
+            
             # Row header (row number 0-7)
-            tk.Label(mem_display_frame, text=f"{row:X}0", width=3, 
-                    bg=self.COLORS["panel"], fg=self.COLORS["text"]).grid(row=row+1, column=0)
+            self.mem_canvas.create_text(header_w // 2, y + cell_h // 2,
+                                        text=hex_digits[row] + "0", fill=self.COLORS["text"])
             
             for col in range(16):
-                address = row * 16 + col
-                label = tk.Label(mem_display_frame, text="0", width=2, relief=tk.SUNKEN,
-                               bg=self.COLORS["button"], fg=self.COLORS["text"])
-                label.grid(row=row+1, column=col+1)
-                self.memory_labels[address] = label
+                x = header_w + col * cell_w
+                rect_id = self.mem_canvas.create_rectangle(x + 1, y + 1, x + cell_w - 1, y + cell_h - 1,
+                                                           fill=self.COLORS["button"],
+                                                           outline=self.COLORS["background"])
+                text_id = self.mem_canvas.create_text(x + cell_w // 2, y + cell_h // 2,
+                                                      text="0", fill=self.COLORS["text"])
+                self._mem_rect_ids.append(rect_id)
+                self._mem_text_ids.append(text_id)
         
         # Program control
         program_frame = tk.LabelFrame(control_frame, text="Program Control", 
@@ -275,6 +587,20 @@ class GMC4GUI:
                            command=self.show_help)
         help_btn.grid(row=0, column=3, padx=5, pady=5)
         
+        # Inline hard reset confirmation, shown below the buttons by
+        # reset_emulator() instead of a modal dialog
+        self._confirm_bar = tk.Frame(button_frame, bg=self.COLORS["panel"])
+        self._confirm_bar.grid(row=1, column=0, columnspan=4, pady=(0, 5))
+        tk.Label(self._confirm_bar, text="Fill ALL memory with F and reset registers?",
+                 bg=self.COLORS["panel"], fg="#FF0000").pack(side=tk.LEFT, padx=5)
+        tk.Button(self._confirm_bar, text="Yes", width=4,
+                  bg=self.COLORS["button"], fg=self.COLORS["text"],
+                  command=self._do_hard_reset).pack(side=tk.LEFT, padx=5)
+        tk.Button(self._confirm_bar, text="No", width=4,
+                  bg=self.COLORS["button"], fg=self.COLORS["text"],
+                  command=self._confirm_bar.grid_remove).pack(side=tk.LEFT, padx=5)
+        self._confirm_bar.grid_remove()
+        
         # Speed control
         speed_frame = tk.Frame(program_frame, bg=self.COLORS["panel"])
         speed_frame.pack(fill=tk.X, expand=True, pady=10)
@@ -306,60 +632,108 @@ class GMC4GUI:
         self.register_display.pack(fill=tk.X, pady=5)
         
         # Create instruction reference
-        reference_frame = tk.LabelFrame(control_frame, text="Instruction Reference", 
-                                      bg=self.COLORS["panel"], fg=self.COLORS["text"],
-                                      padx=10, pady=10)
-        reference_frame.grid(row=5, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
-        
-        reference_text = (
-            "0: KA - Key to A register\n"
-            "1: AO - A register to Output\n"
-            "2: CH - Exchange A/B and Y/Z\n"
-            "3: CY - Exchange A and Y\n"
-            "4: AM - A register to Memory\n"
-            "5: MA - Memory to A register\n"
-            "6: M+ - Add memory to A\n"
-            "7: M- - Subtract memory from A\n"
-            "8: TIA [ ] - Immediate to A\n"
-            "9: AIA [ ] - Add immediate to A\n"
-            "A: TIY [ ] - Immediate to Y\n"
-            "B: AIY [ ] - Add immediate to Y\n"
-            "C: CIA [ ] - Compare immediate to A\n"
-            "D: CIY [ ] - Compare immediate to Y\n"
-            "E: Extended instruction set\n"
-            "F: JUMP [ ] [ ] - Jump to address\n"
-            "\n"
-            "Extended (E0-EF):\n"
-            "E0: RSTO - Clear display\n"
-            "E1: SETR - Turn on LED by Y\n"
-            "E2: RSTR - Turn off LED by Y\n"
-            "E4: CMPL - Complement A\n"
-            "E5: CHNG - Swap register sets\n"
-            "E6: SIFT - Shift A right\n"
-            "E7-EA: Sound instructions\n"
-            "EB: SUND - Play note by A\n"
-            "EC: TIMR - Delay by A value\n"
-            "ED: DSPR - Set LEDs from memory\n"
-            "EE: DEM- - Decimal subtract\n"
-            "EF: DEM+ - Decimal add"
-        )
-        
-        reference_text_widget = scrolledtext.ScrolledText(reference_frame, width=40, height=8,
-                                                        bg=self.COLORS["button"], 
-                                                        fg=self.COLORS["text"])
-        reference_text_widget.insert(tk.END, reference_text)
-        reference_text_widget.configure(state="disabled")
-        reference_text_widget.pack(fill=tk.BOTH, expand=True)
+        self.reference_frame = tk.LabelFrame(control_frame, text="Instruction Reference", 
+                                           bg=self.COLORS["panel"], fg=self.COLORS["text"],
+                                           padx=10, pady=10)
+        self.reference_frame.grid(row=5, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
+        
+        # The reference text widget is only built the first time it is shown
+        self._ref_widget = None
+        self._ref_visible = False
+        self._ref_button = tk.Button(self.reference_frame, text="Show Instruction Reference",
+                                     bg=self.COLORS["button"], fg=self.COLORS["text"],
+                                     command=self._toggle_reference)
+        self._ref_button.pack(fill=tk.X)
+    
+    def _toggle_reference(self):
+        """Show or hide the instruction reference, creating it on first use."""
+        if self._ref_widget is None:
+            self._ref_widget = scrolledtext.ScrolledText(self.reference_frame, width=40, height=8,
+                                                         bg=self.COLORS["button"], 
+                                                         fg=self.COLORS["text"])
+            self._ref_widget.insert(tk.END, self.INSTRUCTION_REFERENCE)
+            self._ref_widget.configure(state="disabled")
+        
+        if self._ref_visible:
+            self._ref_widget.pack_forget()
+            self._ref_button.config(text="Show Instruction Reference")
+        else:
+            self._ref_widget.pack(fill=tk.BOTH, expand=True)
+            self._ref_button.config(text="Hide Instruction Reference")
+        self._ref_visible = not self._ref_visible
     
     def update_displays(self):
-        """Update all displays based on the current state of the emulator."""
-        # Get the current state of the GMC-4
-        gmc4_state = self.gmc4.get_state()
+        """Schedule a repaint of all displays."""
+        self.mark_dirty(self.DIRTY_ALL)
+    
+    def mark_dirty(self, flags):
+        """
+        Mark parts of the GUI as needing a repaint.
         
-        # Store register values
-        self.pc_value = gmc4_state['pc']
-        self.acc_value = gmc4_state['register_a']
+        Repaints are coalesced: however many times this is called before Tk
+        goes idle, the marked parts are painted once.
+        
+        Args:
+            flags: Bitwise OR of the DIRTY_* constants to repaint.
+        """
+        self._dirty |= flags
+        if not self._repaint_scheduled:
+            self._repaint_scheduled = True
+            self.root.after_idle(self._flush)
+    
+    def _flush(self):
+        """Repaint the parts of the GUI that were marked dirty."""
+        dirty = self._dirty
+        self._dirty = 0
+        self._repaint_scheduled = False
+        
+        # Get the current state of the GMC-4; while the run thread is active
+        # only use the snapshots it publishes
+        if self._worker is not None and self._run_state is not None:
+            gmc4_state = self._run_state
+        else:
+            gmc4_state = self.gmc4.snapshot(self._state_buf)
         
+        # Store register values
+        self.pc_value = gmc4_state[GMC4.STATE_PC]
+        self.acc_value = gmc4_state[GMC4.STATE_A]
+        
+        if dirty & self.DIRTY_DISPLAY:
+            self._paint_display(gmc4_state)
+        if dirty & self.DIRTY_LEDS:
+            self._paint_leds(gmc4_state)
+        if dirty & self.DIRTY_BUZZER:
+            self._paint_buzzer(gmc4_state)
+        if dirty & self.DIRTY_MEM:
+            # While running, throttle the memory viewer unless the PC changed row
+            now = time.monotonic()
+            pc_row = gmc4_state[GMC4.STATE_PC] >> 4
+            if (not self.running or pc_row != self._last_pc_row
+                    or now - self._last_mem_paint >= self.MEM_REPAINT_INTERVAL):
+                self._paint_memory(gmc4_state)
+                self._last_mem_paint = now
+                self._last_pc_row = pc_row
+            else:
+                # Defer the skipped repaint to the end of the interval, so the
+                # last memory writes are shown even if no further snapshot
+                # arrives (e.g. the program now waits for a key)
+                self._dirty |= self.DIRTY_MEM
+                if self._mem_repaint_after is None:
+                    remaining = self.MEM_REPAINT_INTERVAL - (now - self._last_mem_paint)
+                    self._mem_repaint_after = self.root.after(
+                        int(remaining * 1000) + 1, self._deferred_mem_repaint)
+        if dirty & self.DIRTY_STATUS:
+            self._paint_status(gmc4_state)
+        if dirty & self.DIRTY_REGS:
+            self._paint_registers(gmc4_state)
+    
+    def _deferred_mem_repaint(self):
+        """Repaint the memory viewer after a throttled update."""
+        self._mem_repaint_after = None
+        self.mark_dirty(self.DIRTY_MEM)
+    
+    def _paint_display(self, gmc4_state):
+        """Update the 7-segment display."""
         # In normal mode, display the value at the current memory address
         # In address input mode, display the address being entered
         # In data input mode, display the data value being entered
@@ -367,7 +741,7 @@ class GMC4GUI:
         
         if self.running:
             # When running, use the display value from the GMC-4 state
-            display_value = gmc4_state['display_value']
+            display_value = gmc4_state[GMC4.STATE_DISPLAY]
         elif self.input_mode == 0:  # Normal mode (not running)
             # In normal mode, display the content at the current memory address
             display_value = self.gmc4.get_memory(self.current_address)
@@ -383,42 +757,45 @@ class GMC4GUI:
                 display_value = self.current_address & 0xF
         elif self.input_mode == 2:  # Data input mode
             display_value = self.gmc4.get_memory(self.current_address)
-        elif self.gmc4.waiting_for_input:  # Input mode from program
+        elif gmc4_state[GMC4.STATE_WAITING]:  # Input mode from program
             # When waiting for input, display the accumulator value
-            display_value = self.acc_value
+            display_value = gmc4_state[GMC4.STATE_A]
         else:
             display_value = self.gmc4.get_memory(self.current_address)
         
-        # Update the single 7-segment display with the appropriate value
+        # Update the single 7-segment display with the appropriate value; it
+        # ignores values it is already showing
         self.segment_display.set_value(display_value)
-        
-        # Update the 7 LEDs
+    
+    def _paint_leds(self, gmc4_state):
+        """Update the 7 LEDs."""
         # In the authentic GMC-4:
         # - When in edit mode, LEDs display current address in binary
         # - When running, LEDs are controlled by the program (stored in gmc4.leds)
         
         if self.running:
             # When running, show LED state as set by program
-            for i in range(7):
-                led_state = gmc4_state['leds'][i]
-                color = self.COLORS["led_on"] if led_state else self.COLORS["led_off"]
-                self.led_indicators[i].itemconfig(1, fill=color)
+            pattern = self.PROGRAM_LED_PATTERNS[gmc4_state[GMC4.STATE_LEDS] & 0x7F]
         else:
             # In edit mode, show binary representation of the current address
-            binary_value = self.current_address
-            
-            # LED order is 6 down to 0 (left to right), while bits are 0 to 6 (right to left)
-            for i in range(7):
-                led_index = i  # LED index in our array (0 = leftmost which is LED 6)
-                bit_position = 6 - i  # Bit position (6 = leftmost LED, 0 = rightmost LED)
-                
-                # Check if the bit at position bit_position is set in the binary value
-                bit_value = 1 if (binary_value & (1 << bit_position)) else 0
-                color = self.COLORS["led_on"] if bit_value else self.COLORS["led_off"]
-                self.led_indicators[led_index].itemconfig(1, fill=color)
+            pattern = self.ADDRESS_LED_PATTERNS[self.current_address & 0x7F]
         
-        # Update the buzzer indicator
-        buzzer_active = gmc4_state['buzzer_active']
+        last_pattern = self._last_led_pattern
+        if pattern == last_pattern:
+            return
+        if last_pattern is None:
+            last_pattern = (None,) * len(pattern)
+        
+        # Only recolor the LEDs whose bit changed, indexing the colors by bit
+        fills = (self.COLORS["led_off"], self.COLORS["led_on"])
+        for (led, oval_id), bit, last_bit in zip(self.led_indicators, pattern, last_pattern):
+            if bit != last_bit:
+                led.itemconfig(oval_id, fill=fills[bit])
+        self._last_led_pattern = pattern
+    
+    def _paint_buzzer(self, gmc4_state):
+        """Update the buzzer indicator."""
+        buzzer_active = gmc4_state[GMC4.STATE_BUZZER]
         if buzzer_active > 0:
             # Different colors for different sounds
             buzzer_colors = {
@@ -440,59 +817,90 @@ class GMC4GUI:
                 5: 400,   # Note sound - medium-short duration
             }
             duration = sound_durations.get(buzzer_active, 500)  # Default to 500ms
-            self.root.after(duration, self.reset_buzzer)
+            if not self._buzzer_reset_pending:
+                self._buzzer_reset_pending = True
+                self.root.after(duration, self._do_reset_buzzer)
         else:
             buzzer_color = "#333333"  # Off
-            
-        self.buzzer_indicator.itemconfig(1, fill=buzzer_color)
-        
-        # Update memory display in the control panel
-        for addr in range(self.gmc4.MEMORY_SIZE):
-            value = self.gmc4.get_memory(addr)
-            self.memory_labels[addr].config(text=f"{value:X}")
-            
-            # Highlight current address
-            if addr == self.current_address:
-                self.memory_labels[addr].config(bg=self.COLORS["highlight"])
-            elif addr == self.gmc4.pc:
-                self.memory_labels[addr].config(bg="#00AA00")  # Highlight PC in green
-            else:
-                self.memory_labels[addr].config(bg=self.COLORS["button"])
         
+        # Only push the fill to Tk when it actually changed
+        if buzzer_color != self._last_buzzer_color:
+            self._last_buzzer_color = buzzer_color
+            self.buzzer_indicator.itemconfig(self._buzzer_oval, fill=buzzer_color)
+    
+    def _paint_memory(self, gmc4_state):
+        """Update the memory display in the control panel."""
+        mem_canvas = self.mem_canvas
+        
+        # Snapshot the emulator memory directly rather than through get_memory()
+        # and only redraw the digits that differ from the last painted snapshot
+        memory = bytes(self.gmc4.memory)
+        prev = self._mem_prev
+        if prev is None:
+            changed = range(len(memory))
+        elif memory == prev:
+            changed = ()
+        else:
+            # Compare whole 16-cell rows first and only scan the rows that differ
+            changed = [addr
+                       for row in range(0, len(memory), 16)
+                       if memory[row:row + 16] != prev[row:row + 16]
+                       for addr in range(row, row + 16)
+                       if memory[addr] != prev[addr]]
+        
+        text_ids = self._mem_text_ids
+        hex_digits = self.HEX_DIGITS
+        for addr in changed:
+            mem_canvas.itemconfig(text_ids[addr], text=hex_digits[memory[addr]])
+        self._mem_prev = memory
+        
+        # Highlight PC in green and the current address, which takes precedence.
+        # Only the cells whose highlight changed are touched
+        highlights = {gmc4_state[GMC4.STATE_PC]: "#00AA00"}
+        highlights[self.current_address] = self.COLORS["highlight"]
+        last_highlights = self._mem_highlights
+        if highlights != last_highlights:
+            rect_ids = self._mem_rect_ids
+            normal_bg = self.COLORS["button"]
+            for addr in last_highlights:
+                if addr not in highlights:
+                    mem_canvas.itemconfig(rect_ids[addr], fill=normal_bg)
+            for addr, bg in highlights.items():
+                if last_highlights.get(addr) != bg:
+                    mem_canvas.itemconfig(rect_ids[addr], fill=bg)
+            self._mem_highlights = highlights
+    
+    def _paint_status(self, gmc4_state):
+        """Update the mode, run status and status message indicators."""
         # Update mode indicator
-        mode_text = "Normal"
-        if self.input_mode == 1:
-            mode_text = "Address Input"
-        elif self.input_mode == 2:
-            mode_text = "Data Input"
-        elif self.gmc4.waiting_for_input:
-            mode_text = "Waiting for Input"
-        self.mode_indicator.config(text=f"Mode: {mode_text}")
+        waiting = bool(gmc4_state[GMC4.STATE_WAITING])
+        mode_text = self.MODE_TEXT[(self.input_mode, waiting)]
+        if mode_text != self._last_mode_text:
+            self.mode_indicator.config(text=mode_text)
+            self._last_mode_text = mode_text
         
         # Update run status
-        status_text = "Running" if self.running else "Stopped"
-        if self.gmc4.halted:
-            status_text = "Halted"
-        elif self.gmc4.waiting_for_input:
-            status_text = "Waiting for Input"
-        self.run_indicator.config(text=f"Status: {status_text}")
+        status_text = self.STATUS_TEXT[(bool(gmc4_state[GMC4.STATE_HALTED]), waiting, self.running)]
+        if status_text != self._last_status_text:
+            self.run_indicator.config(text=status_text)
+            self._last_status_text = status_text
         
         # Update status message if present
-        if hasattr(self, 'status_indicator') and self.status_message:
-            self.status_indicator.config(text=self.status_message, fg="#FF0000")
-        elif hasattr(self, 'status_indicator'):
-            self.status_indicator.config(text="", fg=self.COLORS["text"])
-        
-        # Update register display in the control panel
-        register_text = (
-            f"A: {gmc4_state['register_a']:X}  "
-            f"B: {gmc4_state['register_b']:X}  "
-            f"Y: {gmc4_state['register_y']:X}  "
-            f"Z: {gmc4_state['register_z']:X}  "
-            f"F: {gmc4_state['flag']}"
-        )
-        if hasattr(self, 'register_display'):
+        if self.status_indicator is not None and self.status_message != self._last_status_message:
+            if self.status_message:
+                self.status_indicator.config(text=self.status_message, fg="#FF0000")
+            else:
+                self.status_indicator.config(text="", fg=self.COLORS["text"])
+            self._last_status_message = self.status_message
+    
+    def _paint_registers(self, gmc4_state):
+        """Update the register display in the control panel."""
+        register_text = _format_registers(gmc4_state[GMC4.STATE_A], gmc4_state[GMC4.STATE_B],
+                                          gmc4_state[GMC4.STATE_Y], gmc4_state[GMC4.STATE_Z],
+                                          gmc4_state[GMC4.STATE_FLAG])
+        if self.register_display is not None and register_text != self._last_register_text:
             self.register_display.config(text=register_text)
+            self._last_register_text = register_text
     
     def on_keypad_press(self, key):
         """Handle keypad button press."""
@@ -506,13 +914,13 @@ class GMC4GUI:
         key_value = int(key, 16)
         
         if self.gmc4.waiting_for_input:
-            # Provide input to the emulator
-            self.gmc4.provide_input(key_value)
-            self.update_displays()
-            
-            # If we're running, continue execution
-            if self.running:
-                self.root.after(self.run_delay, self.run_step)
+            if self._worker is not None:
+                # Hand the key to the run thread, which continues execution
+                self._input_queue.put(key_value)
+            else:
+                # Provide input to the emulator
+                self.gmc4.provide_input(key_value)
+                self.mark_dirty(self.DIRTY_DISPLAY | self.DIRTY_REGS | self.DIRTY_STATUS)
             return
         
         if self.input_mode == 1:  # Address input mode
@@ -525,15 +933,16 @@ class GMC4GUI:
                 self.current_address = addr
                 self.input_buffer = ""
                 self.input_mode = 0  # Return to normal mode
-                self.update_displays()
+                self.mark_dirty(self.DIRTY_MEM | self.DIRTY_LEDS | self.DIRTY_DISPLAY | self.DIRTY_STATUS)
         
         elif self.input_mode == 2:  # Data input mode
             # Set the value at the current address
-            self.gmc4.set_memory(self.current_address, key_value)
+            with self._emu_lock:
+                self.gmc4.set_memory(self.current_address, key_value)
             
             # Automatically increment the address
             self.current_address = (self.current_address + 1) % self.gmc4.MEMORY_SIZE
-            self.update_displays()
+            self.mark_dirty(self.DIRTY_MEM | self.DIRTY_LEDS | self.DIRTY_DISPLAY)
         
         elif self.input_mode == 3:  # Post-RESET mode selection
             # After RESET, the user presses either 0 (edit) or 1 (run)
@@ -563,13 +972,14 @@ class GMC4GUI:
                 # Keep waiting for valid input
                 return
                 
-            self.update_displays()
+            self.mark_dirty(self.DIRTY_DISPLAY | self.DIRTY_STATUS)
             
         else:  # Normal mode - store the key value at the current address
             # This is how the original GMC-4 works - pressing a hex key in normal mode 
             # stores that value at the current address
-            self.gmc4.set_memory(self.current_address, key_value)
-            self.update_displays()
+            with self._emu_lock:
+                self.gmc4.set_memory(self.current_address, key_value)
+            self.mark_dirty(self.DIRTY_MEM | self.DIRTY_DISPLAY)
     
     def on_function_key(self, key):
         """Handle function key press."""
@@ -583,7 +993,7 @@ class GMC4GUI:
         elif key == "INCR":
             # Increment the current address (as in original GMC-4) - respect memory size
             self.current_address = (self.current_address + 1) % self.gmc4.MEMORY_SIZE
-            self.update_displays()
+            self.mark_dirty(self.DIRTY_MEM | self.DIRTY_LEDS | self.DIRTY_DISPLAY)
         
         elif key == "RUN":
             # In original GMC-4, you need to press RESET, then 1, then store 1 in memory,
@@ -594,6 +1004,8 @@ class GMC4GUI:
             # If we're at address 0 and the value is 1, or the status flag indicates
             # the user has gone through the RESET+1 sequence, start execution
             if self.run_mode_ready or (self.current_address == 0 and current_value == 1):
+                self._stop_worker()
+                
                 # Start execution from the NEXT address
                 self.current_address = (self.current_address + 1) % self.gmc4.MEMORY_SIZE
                 self.gmc4.pc = self.current_address
@@ -603,9 +1015,8 @@ class GMC4GUI:
                 setattr(self.gmc4, '_from_gui_run', True)
                 print("DEBUG: Starting program execution from GUI - _from_gui_run flag set")
                 
-                self.running = True
                 self.run_mode_ready = False  # Reset the flag
-                self.run_step()
+                self._start_worker()
             else:
                 # Not in run mode - briefly show status message instead of popup
                 self.status_message = "Run sequence: RESET → 1 → RUN"
@@ -616,9 +1027,9 @@ class GMC4GUI:
         elif key == "RESET":
             # In the original GMC-4, the RESET button on the keypad just resets the program counter
             # to the first memory address, but doesn't reset all memory or registers
+            self._stop_worker()
             self.current_address = 0
             self.gmc4.pc = 0
-            self.running = False
             self.run_mode_ready = False
             
             # In the authentic GMC-4, after RESET, the next key press (0 or 1) determines the mode
@@ -632,55 +1043,171 @@ class GMC4GUI:
             
             self.update_displays()
     
-    def run_step(self):
-        """Execute one step when in run mode."""
-        if not self.running:
+    def _start_worker(self):
+        """Start running the program in the background run thread."""
+        self.running = True
+        self._stop_event.clear()
+        self._input_queue = queue.Queue()
+        self._run_state = bytes(self.gmc4.snapshot(self._state_buf))
+        self._worker = threading.Thread(target=self._run_worker, daemon=True)
+        self._worker.start()
+        self._drain_after = self.root.after(self.FRAME_PERIOD_MS, self._drain_state)
+    
+    def _stop_worker(self):
+        """Stop the run thread, if any, and wait for it to finish."""
+        self.running = False
+        self._stop_event.set()
+        if self._drain_after is not None:
+            self.root.after_cancel(self._drain_after)
+            self._drain_after = None
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+    
+    def _publish_state(self, state_buf, last_published):
+        """
+        Hand the current emulator state to the GUI if anything visible changed.
+        
+        The pending snapshot, if the GUI has not picked it up yet, is replaced,
+        so at most one refresh is ever queued.
+        
+        Args:
+            state_buf: Run thread buffer to snapshot the registers into.
+            last_published: (state, memory) pair returned by the previous call,
+                or None.
+            
+        Returns:
+            The (state, memory) pair now visible to the GUI.
+        """
+        published = (bytes(self.gmc4.snapshot(state_buf)), bytes(self.gmc4.memory))
+        if published == last_published:
+            return last_published
+        
+        try:
+            self._state_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._state_queue.put_nowait(published[0])
+        return published
+    
+    def _run_worker(self):
+        """
+        Run thread body: execute the program in batches, paced by run_delay.
+        
+        Only touches the emulator and the queues, never Tk.
+        """
+        gmc4 = self.gmc4
+        stop = self._stop_event
+        state_buf = bytearray(gmc4.STATE_SIZE)
+        published = None
+        next_tick = time.perf_counter()
+        busy = False
+        
+        while not stop.is_set():
+            with self._emu_lock:
+                if self._batch_run:
+                    # Keep running full batches until the frame is over, and
+                    # show only the state reached at its end
+                    busy = gmc4.run(self.RUN_STEP_BUDGET) == self.RUN_STEP_BUDGET
+                    if busy and time.perf_counter() < next_tick:
+                        continue
+                else:
+                    # Run until the program reads the keypad or changes an output
+                    gmc4.run_until_io(self.RUN_STEP_BUDGET)
+                published = self._publish_state(state_buf, published)
+            
+            if gmc4.halted:
+                break
+            
+            if gmc4.waiting_for_input:
+                # Wait for a key, checking for stop requests in between
+                try:
+                    key_value = self._input_queue.get(timeout=self.INPUT_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                with self._emu_lock:
+                    gmc4.provide_input(key_value)
+                    published = self._publish_state(state_buf, published)
+                next_tick = time.perf_counter()
+                continue
+            
+            if self._batch_run and busy:
+                # The program is still computing, carry on with the next frame
+                next_tick = time.perf_counter() + self.run_delay / 1000
+                continue
+            
+            # Start ticks run_delay ms apart, without catching up after stalls
+            next_tick += self.run_delay / 1000
+            delay = next_tick - time.perf_counter()
+            if delay < 0:
+                next_tick -= delay
+                delay = 0
+            stop.wait(delay)
+    
+    def _drain_state(self):
+        """Pick up the latest run thread snapshot and repaint (Tk thread)."""
+        self._drain_after = None
+        if self._worker is None:
             return
         
-        # Execute one instruction
-        if self.gmc4.step():
-            # Schedule next step if not halted or waiting for input
-            if not self.gmc4.halted and not self.gmc4.waiting_for_input:
-                self.root.after(self.run_delay, self.run_step)
+        try:
+            state = self._state_queue.get_nowait()
+        except queue.Empty:
+            pass
         else:
+            # Only repaint the parts whose state changed. Memory is not part of
+            # the snapshot, but the memory viewer only redraws changed cells
+            dirty = self.DIRTY_MEM
+            for field_dirty, old, new in zip(self.STATE_DIRTY, self._run_state, state):
+                if old != new:
+                    dirty |= field_dirty
+            self._run_state = state
+            self.mark_dirty(dirty)
+        
+        if self._run_state[GMC4.STATE_HALTED]:
             # Stop running if halted
-            self.running = False
-        
-        self.update_displays()
+            self._stop_worker()
+            self.mark_dirty(self.DIRTY_ALL)
+        else:
+            self._drain_after = self.root.after(self.FRAME_PERIOD_MS, self._drain_state)
     
     def update_speed(self, value):
         """Update the execution speed based on the scale value."""
-        # Convert scale value (1-10) to delay in ms (500-50)
-        self.run_delay = int(550 - (int(value) * 50))
+        # Coalesce the stream of changes while the scale is dragged
+        if self._speed_after is not None:
+            self.root.after_cancel(self._speed_after)
+        self._speed_after = self.root.after(self.SPEED_DEBOUNCE_MS, self._apply_speed, value)
+    
+    def _apply_speed(self, value):
+        """Apply a speed scale value to the run loop."""
+        self._speed_after = None
+        speed = int(value)
+        self._batch_run = speed >= self.MAX_SPEED
+        if self._batch_run:
+            self.run_delay = self.FRAME_PERIOD_MS
+        else:
+            # Convert scale value (1-9) to delay in ms (500-100)
+            self.run_delay = 550 - speed * 50
     
     def load_program_from_file(self):
         """Load a program from a text file."""
-        file_path = filedialog.askopenfilename(
-            title="Load Program",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
-        )
-        
-        if not file_path:
+        # Ask for the file and the starting address in a single dialog
+        dialog = ProgramFileDialog(self.root, "Load Program", self.gmc4.MEMORY_SIZE,
+                                   self.current_address)
+        if dialog.result is None:
             return
+        file_path, start_addr, _ = dialog.result
         
         try:
-            with open(file_path, 'r') as file:
-                program_text = file.read()
-            
-            # Ask for starting address - respect memory size
-            start_addr = self.current_address
-            max_addr_hex = f"{self.gmc4.MEMORY_SIZE-1:02X}"
-            addr_input = simpledialog.askstring(
-                "Starting Address",
-                f"Enter hexadecimal starting address (00-{max_addr_hex}):",
-                initialvalue=f"{start_addr:02X}"
-            )
-            
-            if addr_input:
-                start_addr = int(addr_input, 16) % self.gmc4.MEMORY_SIZE
+            # Read the whole file in one call and decode it once. Program files
+            # are plain ASCII hex; anything else is skipped by the parser anyway
+            file_size = os.path.getsize(file_path)
+            with open(file_path, 'rb') as file:
+                program_text = file.read(file_size).decode('ascii', errors='ignore')
             
             # Load the program
-            self.gmc4.load_program_from_text(program_text, start_addr)
+            with self._emu_lock:
+                self.gmc4.load_program_from_text(program_text, start_addr)
             self.current_address = start_addr
             self.update_displays()
             
@@ -692,62 +1219,34 @@ class GMC4GUI:
     
     def save_program_to_file(self):
         """Save the current program to a text file."""
-        file_path = filedialog.asksaveasfilename(
-            title="Save Program",
-            defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
-        )
-        
-        if not file_path:
+        # Ask for the file and the address range in a single dialog. Max
+        # address is limited by memory size (127 for original GMC-4)
+        dialog = ProgramFileDialog(self.root, "Save Program", self.gmc4.MEMORY_SIZE,
+                                   0, self.gmc4.MEMORY_SIZE - 1, saving=True)
+        if dialog.result is None:
             return
+        file_path, start_addr, end_addr = dialog.result
         
         try:
-            # Ask for start and end addresses
-            # Max address is limited by memory size (127 for original GMC-4)
-            max_addr_hex = f"{self.gmc4.MEMORY_SIZE-1:02X}"
+            # Copy the range to save, wrapping around the end of memory if
+            # end_addr < start_addr
+            values = self.gmc4.read_memory(start_addr, end_addr)
             
-            start_addr_input = simpledialog.askstring(
-                "Start Address",
-                f"Enter hexadecimal start address (00-{max_addr_hex}):",
-                initialvalue="00"
-            )
+            # Convert all nibbles to hex digits in a single C-level pass
+            hex_bytes = values.translate(self.HEX_TRANSLATION)
             
-            end_addr_input = simpledialog.askstring(
-                "End Address",
-                f"Enter hexadecimal end address (00-{max_addr_hex}):",
-                initialvalue=max_addr_hex
-            )
-            
-            start_addr = 0
-            end_addr = self.gmc4.MEMORY_SIZE - 1
-            
-            if start_addr_input:
-                start_addr = int(start_addr_input, 16) % self.gmc4.MEMORY_SIZE
-            
-            if end_addr_input:
-                end_addr = int(end_addr_input, 16) % self.gmc4.MEMORY_SIZE
-            
-            # Create program text
-            program_text = ""
-            addr = start_addr
-            while addr != (end_addr + 1) % self.gmc4.MEMORY_SIZE:
-                value = self.gmc4.get_memory(addr)
-                program_text += f"{value:X}"
-                
-                # Add space every 8 nibbles for readability
-                if (addr - start_addr + 1) % 8 == 0:
-                    program_text += " "
-                
-                # Add newline every 32 nibbles
-                if (addr - start_addr + 1) % 32 == 0:
-                    program_text += "\n"
-                
-                addr = (addr + 1) % self.gmc4.MEMORY_SIZE
-                if addr == start_addr:
-                    break  # Prevent infinite loop if end_addr < start_addr
+            # Add space every 8 nibbles for readability and a newline every
+            # 32 nibbles
+            out = bytearray()
+            for i in range(0, len(hex_bytes), 8):
+                group = hex_bytes[i:i + 8]
+                out += group
+                if len(group) == 8:
+                    out += b" \n" if (i + 8) % 32 == 0 else b" "
+            program_text = out.decode('ascii')
             
             # Save to file
-            with open(file_path, 'w') as file:
+            with open(file_path, 'w', buffering=self.FILE_BUFFER_SIZE, encoding='ascii') as file:
                 file.write(program_text)
             
             messagebox.showinfo("Program Saved", 
@@ -758,102 +1257,161 @@ class GMC4GUI:
     
     def show_help(self):
         """Show GMC-4 usage instructions."""
-        help_text = """GMC-4 Simulator Usage Instructions:
-
-BASIC OPERATION:
-- The GMC-4 has 128 bytes of memory (addresses 00-7F)
-- Memory values and instructions are 4-bit (0-F)
-- 7 LEDs (labeled 6-0) show the binary value of the current address
-- The single 7-segment display shows the value at the current address
-
-KEYPAD FUNCTIONS:
-- Hexadecimal keys (0-F): Enter data values directly into memory
-- ASET: Enter address selection mode (input two hex digits)
-- INCR: Increment the current address by 1
-- RESET: Reset the program counter to address 0
-- RUN: Run the program starting from the current address
-
-PROGRAM EXECUTION SEQUENCE:
-1. Press RESET
-2. Press 1 (this sets run mode without modifying memory)
-3. Press RUN (execution begins from address 01)
-
-The buzzer provides different sounds:
-- End sound (E7): Program completion
-- Error sound (E8): Error condition
-- Short beep (E9): Quick notification
-- Long beep (EA): Extended notification 
-- Note sound (EB): Musical note based on A register value
-
-MEMORY MAP:
-- 00-4F: Program memory
-- 50-6F: Data memory (for variables)
-- 70-7F: Display memory
-
-More details can be found in the Instruction Reference section."""
-
-        messagebox.showinfo("GMC-4 Help", help_text)
+        messagebox.showinfo("GMC-4 Help", self.HELP_TEXT)
         
     def reset_emulator(self):
         """Hard reset the emulator to its initial state (used by menu items).
         This is different from the RESET button on keypad - it resets all memory to F.
+        
+        The reset only happens once confirmed in the inline confirmation bar,
+        which keeps the main loop running while the question is shown.
         """
-        if messagebox.askyesno("Confirm Hard Reset", 
-                              "Are you sure you want to perform a hard reset? This will fill ALL memory with F and reset registers."):
-            # Hard reset fills all memory with F
-            self.gmc4.memory = [0xF] * self.gmc4.MEMORY_SIZE
-            
-            # Reset registers
-            self.gmc4.register_a = 0
-            self.gmc4.register_b = 0
-            self.gmc4.register_y = 0
-            self.gmc4.register_z = 0
-            self.gmc4.pc = 0
-            self.gmc4.flag = 1
-            
-            # Reset UI state
-            self.current_address = 0
-            self.running = False
-            self.input_mode = 0
-            self.input_buffer = ""
-            
-            # Reset I/O state
-            self.gmc4.display_value = 0
-            self.gmc4.leds = [0] * 7
-            self.gmc4.buzzer_active = 0
-            self.gmc4.halted = False
-            self.gmc4.waiting_for_input = False
-            
-            self.update_displays()
+        self._confirm_bar.grid()
+    
+    def _do_hard_reset(self):
+        """Perform a confirmed hard reset."""
+        self._confirm_bar.grid_remove()
+        
+        # Hard reset fills all memory with F and resets registers, PC, flag
+        # and I/O state
+        self._stop_worker()
+        self.gmc4.reset()
+        
+        # Reset UI state
+        self.current_address = 0
+        self.input_mode = 0
+        self.input_buffer = ""
+        
+        self.update_displays()
+
+
+class ProgramFileDialog(simpledialog.Dialog):
+    """
+    Dialog asking for a program file and its address range in one step.
+    
+    After the dialog closes, result holds (file_path, start_address,
+    end_address), or None if it was cancelled. end_address is None when the
+    dialog only asks for a start address.
+    """
+    
+    FILE_TYPES = [("Text files", "*.txt"), ("All files", "*.*")]
+    
+    def __init__(self, parent, title, memory_size, start_address, end_address=None,
+                 saving=False):
+        """
+        Show the dialog and wait until it is closed.
+        
+        Args:
+            parent: The parent window.
+            title: The dialog title.
+            memory_size: Number of memory addresses; entered addresses wrap
+                around it.
+            start_address: Initial start address.
+            end_address: Initial end address, or None to only ask for a start
+                address.
+            saving: Whether the file is picked for saving rather than loading.
+        """
+        self.dialog_title = title
+        self.memory_size = memory_size
+        self.saving = saving
+        self.path_var = tk.StringVar(master=parent)
+        self.start_var = tk.StringVar(master=parent, value=f"{start_address:02X}")
+        self.end_var = None
+        if end_address is not None:
+            self.end_var = tk.StringVar(master=parent, value=f"{end_address:02X}")
+        self._addresses = ()
+        super().__init__(parent, title)
+    
+    def body(self, master):
+        """Create the file and address fields."""
+        max_addr_hex = f"{self.memory_size - 1:02X}"
+        
+        tk.Label(master, text="File:").grid(row=0, column=0, sticky=tk.W)
+        path_entry = tk.Entry(master, textvariable=self.path_var, width=40)
+        path_entry.grid(row=0, column=1, padx=5)
+        tk.Button(master, text="Browse...", command=self._browse).grid(row=0, column=2)
+        
+        tk.Label(master, text=f"Start address (00-{max_addr_hex}):").grid(
+            row=1, column=0, sticky=tk.W)
+        tk.Entry(master, textvariable=self.start_var, width=4).grid(
+            row=1, column=1, padx=5, sticky=tk.W)
+        
+        if self.end_var is not None:
+            tk.Label(master, text=f"End address (00-{max_addr_hex}):").grid(
+                row=2, column=0, sticky=tk.W)
+            tk.Entry(master, textvariable=self.end_var, width=4).grid(
+                row=2, column=1, padx=5, sticky=tk.W)
+        
+        return path_entry
+    
+    def _browse(self):
+        """Pick the file with the standard file dialog."""
+        if self.saving:
+            file_path = filedialog.asksaveasfilename(
+                parent=self, title=self.dialog_title, defaultextension=".txt",
+                filetypes=self.FILE_TYPES)
+        else:
+            file_path = filedialog.askopenfilename(
+                parent=self, title=self.dialog_title, filetypes=self.FILE_TYPES)
+        
+        if file_path:
+            self.path_var.set(file_path)
+    
+    def validate(self):
+        """Check that a file is chosen and the addresses are hexadecimal."""
+        if not self.path_var.get().strip():
+            messagebox.showerror("Error", "Please choose a file.", parent=self)
+            return False
+        
+        try:
+            self._addresses = tuple(int(var.get(), 16) % self.memory_size
+                                    for var in (self.start_var, self.end_var)
+                                    if var is not None)
+        except ValueError:
+            messagebox.showerror("Error", "Addresses must be hexadecimal (00-"
+                                 f"{self.memory_size - 1:02X}).", parent=self)
+            return False
+        return True
+    
+    def apply(self):
+        """Store the chosen file and addresses in result."""
+        start_address = self._addresses[0]
+        end_address = self._addresses[1] if self.end_var is not None else None
+        self.result = (self.path_var.get().strip(), start_address, end_address)
 
 
 class SevenSegmentDisplay:
     """
     Seven-segment display widget for showing hexadecimal digits.
+    
+    All 16 digits are rendered once into PhotoImage sprites when the widget is
+    created, so changing the shown value is a single canvas item update.
     """
     
-    # Segment patterns for hexadecimal digits (0-F)
-    # Segments are ordered as: A, B, C, D, E, F, G
+    # Segment bitmasks for hexadecimal digits (0-F)
+    # Bits 0-6 are segments A, B, C, D, E, F, G
     # Where A is the top segment, and G is the middle segment
     # These patterns follow the standard 7-segment display for hexadecimal
-    PATTERNS = {
-        0: [1, 1, 1, 1, 1, 1, 0],  # 0
-        1: [0, 1, 1, 0, 0, 0, 0],  # 1
-        2: [1, 1, 0, 1, 1, 0, 1],  # 2
-        3: [1, 1, 1, 1, 0, 0, 1],  # 3
-        4: [0, 1, 1, 0, 0, 1, 1],  # 4
-        5: [1, 0, 1, 1, 0, 1, 1],  # 5
-        6: [1, 0, 1, 1, 1, 1, 1],  # 6
-        7: [1, 1, 1, 0, 0, 0, 0],  # 7
-        8: [1, 1, 1, 1, 1, 1, 1],  # 8
-        9: [1, 1, 1, 1, 0, 1, 1],  # 9
-        10: [1, 1, 1, 0, 1, 1, 1],  # A
-        11: [0, 0, 1, 1, 1, 1, 1],  # B
-        12: [1, 0, 0, 1, 1, 1, 0],  # C
-        13: [0, 1, 1, 1, 1, 0, 1],  # D
-        14: [1, 0, 0, 1, 1, 1, 1],  # E
-        15: [1, 0, 0, 0, 1, 1, 1],  # F
-    }
+    SEGMENT_BITS = (
+        0x3F, 0x06, 0x5B, 0x4F,  # 0 1 2 3
+        0x66, 0x6D, 0x7D, 0x07,  # 4 5 6 7
+        0x7F, 0x6F, 0x77, 0x7C,  # 8 9 A B
+        0x39, 0x5E, 0x79, 0x71,  # C D E F
+    )
+    
+    # Segment fill colors, indexed by the segment bit (off, on)
+    _COLORS = ("#303030", "#FF0000")
+    
+    # Fill color of segments A-G for each digit
+    FILL_TABLE = _build_fill_table(SEGMENT_BITS, _COLORS)
+    
+    # Segment bits in stacking order, topmost first, where the segment outlines
+    # overlap at the corners
+    SEGMENT_STACKING = (2, 4, 1, 5, 3, 6, 0)  # C, E, B, F, D, G, A
+    
+    # Segment outlines and pixel segment map for each display size, shared by
+    # all widgets of that size
+    _GEOM_CACHE = {}
     
     def __init__(self, parent, size=30):
         """
@@ -865,92 +1423,121 @@ class SevenSegmentDisplay:
         """
         self.parent = parent
         self.size = size
+        self.width = size
+        self.height = int(size * 1.5)
         
         # Calculate segment dimensions
         self.seg_length = int(size * 0.8)
         self.seg_width = max(int(size * 0.15), 3)
         
         # Create canvas
-        self.canvas = tk.Canvas(parent, width=size, height=size*1.5,
+        self.canvas = tk.Canvas(parent, width=self.width, height=self.height,
                               bg="#000000", highlightthickness=0)
         
-        # Create segments
-        self.segments = []
-        
-        # Horizontal segments (A, G, D)
-        # A - top
-        self.segments.append(self._create_h_segment(size/2, size*0.1))
-        # G - middle
-        self.segments.append(self._create_h_segment(size/2, size*0.75))
-        # D - bottom
-        self.segments.append(self._create_h_segment(size/2, size*1.4))
-        
-        # Vertical segments (F, B, E, C)
-        # F - top left
-        self.segments.append(self._create_v_segment(size*0.1, size*0.425))
-        # B - top right
-        self.segments.append(self._create_v_segment(size*0.9, size*0.425))
-        # E - bottom left
-        self.segments.append(self._create_v_segment(size*0.1, size*1.075))
-        # C - bottom right
-        self.segments.append(self._create_v_segment(size*0.9, size*1.075))
-        
-        # Initialize with value 0
-        self.set_value(0)
-    
-    def _create_h_segment(self, x, y):
-        """Create a horizontal segment at the given position."""
-        points = [
-            x - self.seg_length/2, y,
-            x - self.seg_length/2 + self.seg_width/2, y - self.seg_width/2,
-            x + self.seg_length/2 - self.seg_width/2, y - self.seg_width/2,
-            x + self.seg_length/2, y,
-            x + self.seg_length/2 - self.seg_width/2, y + self.seg_width/2,
-            x - self.seg_length/2 + self.seg_width/2, y + self.seg_width/2
-        ]
-        return self.canvas.create_polygon(points, fill="#303030", outline="")
-    
-    def _create_v_segment(self, x, y):
-        """Create a vertical segment at the given position."""
-        points = [
-            x, y - self.seg_length/2,
-            x + self.seg_width/2, y - self.seg_length/2 + self.seg_width/2,
-            x + self.seg_width/2, y + self.seg_length/2 - self.seg_width/2,
-            x, y + self.seg_length/2,
-            x - self.seg_width/2, y + self.seg_length/2 - self.seg_width/2,
-            x - self.seg_width/2, y - self.seg_length/2 + self.seg_width/2
-        ]
-        return self.canvas.create_polygon(points, fill="#303030", outline="")
+        # The geometry only depends on the size, so compute it once per size
+        geometry = self._GEOM_CACHE.get(size)
+        if geometry is None:
+            # Segment outlines, indexed by segment bit (A-G)
+            self.segment_points = (
+                self._h_segment_points(size/2, size*0.1),     # A - top
+                self._v_segment_points(size*0.9, size*0.425),  # B - top right
+                self._v_segment_points(size*0.9, size*1.075),  # C - bottom right
+                self._h_segment_points(size/2, size*1.4),     # D - bottom
+                self._v_segment_points(size*0.1, size*1.075),  # E - bottom left
+                self._v_segment_points(size*0.1, size*0.425),  # F - top left
+                self._h_segment_points(size/2, size*0.75),    # G - middle
+            )
+            geometry = (self.segment_points, self._segment_map())
+            self._GEOM_CACHE[size] = geometry
+        self.segment_points, self._pixel_segments = geometry
+        
+        # Pre-render one sprite per digit and show them through a single item
+        self._digit_images = self._render_digits()
+        self.image_item = self.canvas.create_image(0, 0, anchor=tk.NW,
+                                                   image=self._digit_images[0])
+        
+        # Value currently shown, so repeated set_value() calls skip the Tk
+        # update
+        self._last_value = 0
+    
+    def _h_segment_points(self, x, y):
+        """Return the outline of a horizontal segment centered at the given position."""
+        return (
+            (x - self.seg_length/2, y),
+            (x - self.seg_length/2 + self.seg_width/2, y - self.seg_width/2),
+            (x + self.seg_length/2 - self.seg_width/2, y - self.seg_width/2),
+            (x + self.seg_length/2, y),
+            (x + self.seg_length/2 - self.seg_width/2, y + self.seg_width/2),
+            (x - self.seg_length/2 + self.seg_width/2, y + self.seg_width/2)
+        )
+    
+    def _v_segment_points(self, x, y):
+        """Return the outline of a vertical segment centered at the given position."""
+        return (
+            (x, y - self.seg_length/2),
+            (x + self.seg_width/2, y - self.seg_length/2 + self.seg_width/2),
+            (x + self.seg_width/2, y + self.seg_length/2 - self.seg_width/2),
+            (x, y + self.seg_length/2),
+            (x - self.seg_width/2, y + self.seg_length/2 - self.seg_width/2),
+            (x - self.seg_width/2, y - self.seg_length/2 + self.seg_width/2)
+        )
+    
+    @staticmethod
+    def _inside(points, px, py):
+        """Return whether (px, py) lies inside the polygon given by points."""
+        inside = False
+        x1, y1 = points[-1]
+        for x2, y2 in points:
+            if (y1 > py) != (y2 > py) and px < x1 + (py - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+            x1, y1 = x2, y2
+        return inside
+    
+    def _segment_map(self):
+        """
+        Return, for each pixel row, the segment covering each pixel.
+        
+        Returns:
+            Tuple of rows, each a tuple of segment bits (0-6), or 7 where no
+            segment covers the pixel.
+        """
+        stacked = [(bit, self.segment_points[bit]) for bit in self.SEGMENT_STACKING]
+        rows = []
+        for py in range(self.height):
+            cy = py + 0.5
+            row = []
+            for px in range(self.width):
+                cx = px + 0.5
+                covering = 7
+                for bit, points in stacked:
+                    if self._inside(points, cx, cy):
+                        covering = bit
+                        break
+                row.append(covering)
+            rows.append(tuple(row))
+        return tuple(rows)
+    
+    def _render_digits(self):
+        """Render a PhotoImage for each hexadecimal digit."""
+        segment_map = self._pixel_segments
+        images = []
+        for fills in self.FILL_TABLE:
+            # Color of each segment bit for this digit, then the background
+            colors = fills + ("#000000",)
+            
+            image = tk.PhotoImage(master=self.canvas, width=self.width, height=self.height)
+            image.put(" ".join("{" + " ".join([colors[s] for s in row]) + "}"
+                               for row in segment_map))
+            images.append(image)
+        return images
     
     def set_value(self, value):
         """Set the display to show the given value (0-F)."""
         value = value & 0xF  # Ensure value is 0-15
-        pattern = self.PATTERNS[value]
-        
-        # In our implementation:
-        # self.segments = [A, G, D, F, B, E, C] (indices 0-6)
-        
-        # Pattern defines segments in order: A, B, C, D, E, F, G
-        # So we need to map them properly:
-        # A=0, B=4, C=6, D=2, E=5, F=3, G=1
-        
-        mapping = {
-            0: 0,  # A
-            1: 4,  # B
-            2: 6,  # C
-            3: 2,  # D
-            4: 5,  # E
-            5: 3,  # F
-            6: 1,  # G
-        }
-        
-        for i in range(7):
-            # Get the segment index from our mapping
-            segment_idx = mapping[i]
-            # Get whether this segment should be on or off
-            on = pattern[i]
-            fill_color = "#FF0000" if on else "#303030"
-            self.canvas.itemconfig(self.segments[segment_idx], fill=fill_color)
+        if value == self._last_value:
+            return
+        self._last_value = value
+        self.canvas.itemconfig(self.image_item, image=self._digit_images[value])
     
     def grid(self, row=0, column=0, padx=0, pady=0):
         """Grid layout the display in its parent widget."""